@@ -1,21 +1,72 @@
 from flask import Flask, render_template, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 from google.cloud import bigquery
+import google.auth
+from google.auth.transport.requests import AuthorizedSession
+import requests
+# Optional: faster JSON encoding for API responses
+try:
+    import orjson
+except ImportError:
+    orjson = None
+# Optional: lets query_rows pull results over the BigQuery Storage API as Arrow
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+try:
+    from google.cloud import bigquery_storage
+except ImportError:
+    bigquery_storage = None
 import os
+import sys
 import json
+import hashlib
 from datetime import datetime
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.mime.base import MIMEBase
-from email import encoders
+from email.message import EmailMessage, MIMEPart
 import io
+import copy
+import gzip
+import time
+import threading
+import atexit
+import queue
+import inspect
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache, wraps
+from collections import namedtuple, defaultdict
+from bisect import bisect_left
 
 # NEW IMPORTS FOR WEASYPRINT
 import weasyprint
-from jinja2 import Template
+try:
+    from weasyprint.text.fonts import FontConfiguration
+except ImportError:
+    # WeasyPrint < 53
+    from weasyprint.fonts import FontConfiguration
+from jinja2 import Environment, FileSystemLoader, TemplateNotFound
 
 app = Flask(__name__)
 
+class OrjsonProvider(DefaultJSONProvider):
+    """Encode JSON responses with orjson; types it can't handle go through Flask's default"""
+    
+    def dumps(self, obj, **kwargs):
+        # Keep Flask's output: sorted keys, HTTP-date datetimes, non-string keys allowed
+        option = orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
 # Load email configuration from file
 def load_email_config():
     try:
@@ -47,17 +98,424 @@ else:
     EMAIL_PASSWORD = ''
     EMAIL_FROM = ''
 
+# Number of pitcher reports generated/sent concurrently by /api/send-emails
+EMAIL_SEND_WORKERS = 8
+# Worker processes rendering PDFs for /api/send-emails (WeasyPrint layout is CPU-bound)
+PDF_WORKERS = os.cpu_count() or 1
+
 # Set up Google Cloud credentials
 os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = 'harvard-baseball-13fab221b2d4.json'
 
+# HTTP connections kept open for BigQuery calls; sized for concurrent Flask
+# requests plus the send-emails worker threads querying at the same time
+BIGQUERY_HTTP_POOL_SIZE = 20
+
+def create_bigquery_client():
+    """BigQuery client whose HTTP session reuses a pool of BIGQUERY_HTTP_POOL_SIZE connections"""
+    credentials, project = google.auth.default(scopes=bigquery.Client.SCOPE)
+    session = AuthorizedSession(credentials)
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=BIGQUERY_HTTP_POOL_SIZE,
+        pool_maxsize=BIGQUERY_HTTP_POOL_SIZE
+    )
+    session.mount('https://', adapter)
+    
+    # Merged into every query's job config: all our queries are small UI lookups, so run them
+    # interactively and let repeated identical SQL (e.g. /api/stats) come from BigQuery's result cache
+    default_query_job_config = bigquery.QueryJobConfig(
+        priority=bigquery.QueryPriority.INTERACTIVE,
+        use_query_cache=True
+    )
+    return bigquery.Client(
+        project=project,
+        credentials=credentials,
+        _http=session,
+        default_query_job_config=default_query_job_config
+    )
+
 # Initialize BigQuery client
 try:
-    client = bigquery.Client()
+    client = create_bigquery_client()
     print("BigQuery client initialized successfully")
 except Exception as e:
     print(f"Error initializing BigQuery client: {e}")
     client = None
 
+# One Storage Read API client (gRPC channel) shared by all queries, instead of
+# letting each to_arrow() call create and tear down its own
+bqstorage_client = None
+if client is not None and pyarrow is not None and bigquery_storage is not None:
+    try:
+        bqstorage_client = bigquery_storage.BigQueryReadClient()
+        print("BigQuery Storage client initialized successfully")
+    except Exception as e:
+        print(f"Error initializing BigQuery Storage client: {e}")
+
+def query_rows(query, job_config=None):
+    """Run a query and return its rows as a list of dicts.
+    
+    Reads as Arrow when pyarrow is installed - streamed over the BigQuery Storage API
+    when its client is available - which is much faster than decoding the REST JSON
+    rows for pitch-level tables.
+    """
+    query_job = client.query(query, job_config=job_config)
+    if pyarrow is not None:
+        try:
+            arrow_table = query_job.result().to_arrow(
+                bqstorage_client=bqstorage_client,
+                create_bqstorage_client=False
+            )
+            return arrow_table.to_pylist()
+        except Exception as e:
+            print(f"Arrow read failed, falling back to row iteration: {e}")
+    return [dict(row) for row in query_job.result()]
+
+# Columns the emailed report actually uses (plots, zone rates, comparisons, pitch table);
+# selecting just these instead of * cuts the bytes scanned and transferred
+PITCH_REPORT_COLUMNS = [
+    'PitchNo', 'Pitcher', 'PitcherThrows', 'TaggedPitchType',
+    'RelSpeed', 'SpinRate', 'InducedVertBreak', 'HorzBreak',
+    'RelSide', 'RelHeight', 'Extension', 'PlateLocHeight', 'PlateLocSide'
+]
+PITCH_REPORT_SELECT = ', '.join(PITCH_REPORT_COLUMNS)
+
+# Low-cardinality text columns repeated on every pitch row
+PITCH_CATEGORY_FIELDS = ('Pitcher', 'PitcherThrows', 'TaggedPitchType')
+
+def normalize_pitch_rows(pitch_rows):
+    """Intern the repeated text columns so all rows share one string per value"""
+    for pitch in pitch_rows:
+        for field in PITCH_CATEGORY_FIELDS:
+            value = pitch.get(field)
+            if isinstance(value, str):
+                pitch[field] = sys.intern(value)
+    return pitch_rows
+
+class TTLCache:
+    """Small thread-safe cache whose entries expire after `ttl` seconds"""
+    
+    def __init__(self, ttl, maxsize=1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            return value
+    
+    def set(self, key, value, ttl=None):
+        """Store value under key for `ttl` seconds (the cache's ttl by default)"""
+        with self._lock:
+            if key not in self._data and len(self._data) >= self.maxsize:
+                # Evict the oldest entry
+                self._data.pop(next(iter(self._data)))
+            self._data[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))
+    
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+    
+    def snapshot(self):
+        """Unexpired (key, value, seconds left) entries, e.g. to seed the same cache in another process"""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                (key, value, expires_at - now)
+                for key, (value, expires_at) in self._data.items() if expires_at >= now
+            ]
+
+def ttl_cached(cache):
+    """Cache a BigQuery lookup's results in `cache`, keyed on its (defaulted) arguments.
+    
+    None results are not cached since the lookups also return None on query errors.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = bound.args
+            
+            value = cache.get(key)
+            if value is None:
+                value = func(*args, **kwargs)
+                if value is not None:
+                    cache.set(key, value)
+            return value
+        
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+# College aggregates change rarely; cache them so batch runs don't re-query
+# the same (pitch_type, level, handedness) combination for every pitcher
+college_averages_cache = TTLCache(ttl=300)
+# Marks (under 'all') that preload_college_averages filled college_averages_cache
+college_averages_preloaded = TTLCache(ttl=college_averages_cache.ttl, maxsize=1)
+college_max_velocity_averages_cache = TTLCache(ttl=300)
+# The whole Info table as {prospect: comp}, under a single 'all' key
+competition_levels_cache = TTLCache(ttl=600, maxsize=1)
+
+# Info table rows; prospects change rarely, so share one copy between requests
+prospects_cache = TTLCache(ttl=300, maxsize=1)
+
+# Pitch rows per (date, pitcher); /api/pitchers prefetches a whole date in the background
+pitch_data_cache = TTLCache(ttl=300, maxsize=512)
+# Dates whose prefetch finished recently (so repeat /api/pitchers calls don't redo it) or is running
+prefetched_dates = TTLCache(ttl=300, maxsize=32)
+prefetching_dates = set()
+prefetch_lock = threading.Lock()
+
+# Column types of V1PBR.Test, looked up once an hour
+column_type_cache = TTLCache(ttl=3600, maxsize=32)
+# Cached when the lookup fails, so a failing INFORMATION_SCHEMA query isn't re-run on every request
+UNKNOWN_COLUMN_TYPE = 'UNKNOWN'
+
+@ttl_cached(column_type_cache)
+def get_test_column_type(column_name):
+    """Data type of a V1PBR.Test column (e.g. 'DATE' or 'STRING'), UNKNOWN_COLUMN_TYPE if it can't be looked up"""
+    try:
+        query = """
+        SELECT data_type
+        FROM `V1PBR.INFORMATION_SCHEMA.COLUMNS`
+        WHERE table_name = 'Test'
+        AND column_name = @column_name
+        """
+        
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[
+                bigquery.ScalarQueryParameter("column_name", "STRING", column_name),
+            ]
+        )
+        
+        row = next(iter(client.query(query, job_config=job_config)), None)
+        return row.data_type if row else UNKNOWN_COLUMN_TYPE
+    
+    except Exception as e:
+        print(f"Error looking up type of Test.{column_name}: {str(e)}")
+        return UNKNOWN_COLUMN_TYPE
+
+def date_filter(selected_date):
+    """WHERE predicate and @date query parameter matching V1PBR.Test's Date to selected_date.
+    
+    Comparing Date directly (instead of CAST(Date AS STRING)) lets BigQuery prune
+    partitions/clusters on it. Falls back to the string cast for other column types.
+    """
+    date_type = get_test_column_type('Date')
+    if date_type == 'DATE':
+        try:
+            parsed_date = datetime.strptime(selected_date, '%Y-%m-%d').date()
+            return "Date = @date", bigquery.ScalarQueryParameter("date", "DATE", parsed_date)
+        except ValueError:
+            pass  # Not a YYYY-MM-DD date; the string comparison below just won't match
+    elif date_type == 'STRING':
+        return "Date = @date", bigquery.ScalarQueryParameter("date", "STRING", selected_date)
+    return "CAST(Date AS STRING) = @date", bigquery.ScalarQueryParameter("date", "STRING", selected_date)
+
+@ttl_cached(prospects_cache)
+def get_prospects():
+    """All Info table rows as dicts (Event, Prospect, Email, Type, Comp), ordered by Prospect.
+    
+    The list is shared between requests, so don't modify it.
+    """
+    query = """
+    SELECT Event, Prospect, Email, Type, Comp
+    FROM `V1PBRInfo.Info`
+    ORDER BY Prospect
+    """
+    return query_rows(query)
+
+@ttl_cached(pitch_data_cache)
+def get_pitcher_pitch_data(selected_date, pitcher_name):
+    """Report columns of a pitcher's pitches on a date, in pitch order (cached; don't modify the list)"""
+    date_predicate, date_parameter = date_filter(selected_date)
+    
+    query = f"""
+    SELECT {PITCH_REPORT_SELECT}
+    FROM `V1PBR.Test`
+    WHERE {date_predicate}
+    AND Pitcher = @pitcher
+    ORDER BY PitchNo
+    """
+    
+    job_config = bigquery.QueryJobConfig(
+        query_parameters=[
+            date_parameter,
+            bigquery.ScalarQueryParameter("pitcher", "STRING", pitcher_name),
+        ]
+    )
+    
+    # Interned once here, since cached rows must not be modified afterwards
+    return normalize_pitch_rows(query_rows(query, job_config=job_config))
+
+def prefetch_pitch_data(selected_date):
+    """Load every pitcher's pitches for a date into pitch_data_cache with one query"""
+    try:
+        date_predicate, date_parameter = date_filter(selected_date)
+        
+        query = f"""
+        SELECT {PITCH_REPORT_SELECT}
+        FROM `V1PBR.Test`
+        WHERE {date_predicate}
+        AND Pitcher IS NOT NULL
+        ORDER BY Pitcher, PitchNo
+        """
+        
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[date_parameter]
+        )
+        
+        pitch_data_by_pitcher = defaultdict(list)
+        for pitch in normalize_pitch_rows(query_rows(query, job_config=job_config)):
+            pitch_data_by_pitcher[pitch['Pitcher']].append(pitch)
+        
+        # Same keys as get_pitcher_pitch_data's cache
+        for pitcher_name, pitch_data in pitch_data_by_pitcher.items():
+            pitch_data_cache.set((selected_date, pitcher_name), pitch_data)
+        prefetched_dates.set(selected_date, True)
+        print(f"Prefetched pitch data for {len(pitch_data_by_pitcher)} pitchers on {selected_date}")
+    
+    except Exception as e:
+        print(f"Error prefetching pitch data for {selected_date}: {str(e)}")
+    
+    finally:
+        with prefetch_lock:
+            prefetching_dates.discard(selected_date)
+
+def start_pitch_data_prefetch(selected_date):
+    """Prefetch a date's pitch data in a background thread (at most one per date at a time)"""
+    with prefetch_lock:
+        if selected_date in prefetching_dates or prefetched_dates.get(selected_date):
+            return
+        prefetching_dates.add(selected_date)
+    threading.Thread(target=prefetch_pitch_data, args=(selected_date,), daemon=True).start()
+
+# Colors for pitch types (shared by the movement and pitch location plots)
+PITCH_COLORS = {
+    'ChangeUp': '#059669', 'Curveball': '#1D4ED8', 'Cutter': '#BE185D',
+    'Fastball': '#DC2626', 'Knuckleball': '#9333EA', 'Sinker': '#EA580C',
+    'Slider': '#7C3AED', 'Splitter': '#0891B2', 'Sweeper': '#F59E0B',
+    'Four-Seam': '#DC2626', '4-Seam': '#DC2626', 'Two-Seam': '#EA580C',
+    'TwoSeam': '#EA580C', 'Changeup': '#059669', 'Change-up': '#059669',
+    'Curve': '#1D4ED8', 'Cut Fastball': '#BE185D', 'Split-Finger': '#0891B2'
+}
+
+# Minified <defs><style> blocks for the SVG plots. Both plots can be inlined into the
+# same report, so a class shared between them keeps the same short name.
+#   sz strike-zone, sh shadow-zone, hpb/hpt home plate base/top, pc plate connector,
+#   al axis-line, gl grid-line, at axis-text, ax axis-title, lt legend-text,
+#   pt plot-title, ps plot-subtitle, pb plot-border, ce confidence-ellipse,
+#   hp home-plate, rt release-text
+LOCATION_PLOT_DEFS = (
+    '<defs><style>'
+    '.sz{stroke:#000;stroke-width:2;fill:none}'
+    '.sh{stroke:#000;stroke-width:1;fill:none;stroke-dasharray:3,3}'
+    '.hpb{stroke:#000;stroke-width:1;fill:#f0f0f0}'
+    '.hpt{stroke:#000;stroke-width:2;fill:#fff}'
+    '.pc{stroke:#000;stroke-width:1}'
+    '.at{font-family:Arial,sans-serif;font-size:10px;fill:#000}'
+    '.pt{font-family:Arial,sans-serif;font-size:16px;font-weight:700;fill:#1a1a1a;text-anchor:start}'
+    '.ps{font-family:Arial,sans-serif;font-size:12px;fill:#666;text-anchor:start;font-style:italic}'
+    '.lt{font-family:Arial,sans-serif;font-size:9px;fill:#000}'
+    '</style></defs>'
+)
+
+MOVEMENT_PLOT_DEFS = (
+    '<defs><style>'
+    '.al{stroke:#900;stroke-width:2}'
+    '.gl{stroke:rgba(0,0,0,.2);stroke-width:1}'
+    '.at{font-family:Arial,sans-serif;font-size:10px;fill:#000}'
+    '.ax{font-family:Arial,sans-serif;font-size:12px;font-weight:700;fill:#000}'
+    '.lt{font-family:Arial,sans-serif;font-size:9px;fill:#000}'
+    '.pt{font-family:Arial,sans-serif;font-size:14px;font-weight:700;fill:#1a1a1a;text-anchor:start}'
+    '.ps{font-family:Arial,sans-serif;font-size:10px;fill:#666;text-anchor:start;font-style:italic}'
+    '.pb{stroke:#000;stroke-width:2;fill:none}'
+    '.ce{fill:none;stroke-width:1.5;stroke-opacity:.7}'
+    '.hp{stroke:#900;stroke-width:2;fill:#fff}'
+    '.rt{font-family:Arial,sans-serif;font-size:12px;font-weight:700;fill:#900;text-anchor:middle}'
+    '</style></defs>'
+)
+
+# Pitch name variations used to categorize pitch types (matched as substrings)
+# These should break away from arm side (glove side break)
+BREAKING_BALL_PATTERNS = frozenset([
+    'curveball', 'curve', 'slider', 'cutter', 'cut fastball', 'sweeper'
+])
+
+# These should have arm-side run
+ARM_SIDE_RUN_PATTERNS = frozenset([
+    'fastball', 'four-seam', '4-seam', 'fourseam', 'four seam',
+    'sinker', 'two-seam', '2-seam', 'twoseam', 'two seam',
+    'changeup', 'change-up', 'change up', 'changup',
+    'splitter', 'split-finger', 'splitfinger', 'split finger',
+    'knuckleball', 'knuckle ball'
+])
+
+# Pitches where negative IVB is better (breaking balls, offspeed and sinkers)
+NEGATIVE_IVB_PATTERNS = frozenset([
+    'curveball', 'curve',
+    'changeup', 'change-up', 'change up', 'changup',
+    'splitter', 'split-finger', 'splitfinger', 'split finger',
+    'knuckleball', 'knuckle ball',
+    'sinker', 'two-seam', '2-seam', 'twoseam', 'two seam'
+])
+
+# Pitches where lower velocity is better (offspeed pitches)
+LOWER_VELO_PATTERNS = frozenset([
+    'changeup', 'change-up', 'change up', 'changup',
+    'splitter', 'split-finger', 'splitfinger', 'split finger',
+    'knuckleball', 'knuckle ball'
+])
+
+# Pitches where lower spin rate is better
+LOWER_SPIN_PATTERNS = frozenset([
+    'splitter', 'split-finger', 'splitfinger', 'split finger',
+    'knuckleball', 'knuckle ball'
+])
+
+# Break/velocity/spin expectations for a pitch type, see classify_pitch()
+PitchTraits = namedtuple('PitchTraits', ['breaking', 'arm_side_run', 'negative_ivb', 'lower_velo', 'lower_spin'])
+
+@lru_cache(maxsize=64)
+def classify_pitch(pitch_type):
+    """Categorize a pitch type once so the is_*_better checks are simple lookups"""
+    pitch_type_lower = pitch_type.lower()
+    
+    def matches(patterns):
+        return any(pattern in pitch_type_lower for pattern in patterns)
+    
+    return PitchTraits(
+        breaking=matches(BREAKING_BALL_PATTERNS),
+        arm_side_run=matches(ARM_SIDE_RUN_PATTERNS),
+        negative_ivb=matches(NEGATIVE_IVB_PATTERNS),
+        lower_velo=matches(LOWER_VELO_PATTERNS),
+        lower_spin=matches(LOWER_SPIN_PATTERNS)
+    )
+
+def college_averages_from_row(row):
+    """Convert a college averages result row into the averages dict used for comparisons"""
+    return {
+        'avg_velocity': float(row.avg_velocity) if row.avg_velocity else None,
+        'avg_spin_rate': float(row.avg_spin_rate) if row.avg_spin_rate else None,
+        'avg_ivb': float(row.avg_ivb) if row.avg_ivb else None,
+        'avg_hb': float(row.avg_hb) if row.avg_hb else None,
+        'avg_rel_side': float(row.avg_rel_side) if row.avg_rel_side else None,
+        'avg_rel_height': float(row.avg_rel_height) if row.avg_rel_height else None,
+        'avg_extension': float(row.avg_extension) if row.avg_extension else None,
+        'pitch_count': int(row.pitch_count)
+    }
+
+@ttl_cached(college_averages_cache)
 def get_college_averages(pitch_type, comparison_level='D1', pitcher_throws='Right'):
     """Get college baseball averages for comparison, filtered by pitcher handedness"""
     try:
@@ -95,25 +553,64 @@ def get_college_averages(pitch_type, comparison_level='D1', pitcher_throws='Righ
         )
         
         result = client.query(query, job_config=job_config)
-        row = list(result)[0] if result else None
+        row = next(iter(result), None)
         
         if row and row.pitch_count > 0:
-            return {
-                'avg_velocity': float(row.avg_velocity) if row.avg_velocity else None,
-                'avg_spin_rate': float(row.avg_spin_rate) if row.avg_spin_rate else None,
-                'avg_ivb': float(row.avg_ivb) if row.avg_ivb else None,
-                'avg_hb': float(row.avg_hb) if row.avg_hb else None,
-                'avg_rel_side': float(row.avg_rel_side) if row.avg_rel_side else None,
-                'avg_rel_height': float(row.avg_rel_height) if row.avg_rel_height else None,
-                'avg_extension': float(row.avg_extension) if row.avg_extension else None,
-                'pitch_count': int(row.pitch_count)
-            }
+            return college_averages_from_row(row)
         return None
         
     except Exception as e:
         print(f"Error getting college averages for {pitch_type} ({pitcher_throws}): {str(e)}")
         return None
 
+def preload_college_averages():
+    """Warm the college averages cache for every pitch type, level and handedness with one query"""
+    if college_averages_preloaded.get('all'):
+        return  # Already preloaded within the TTL
+    
+    try:
+        metrics = """
+            AVG(RelSpeed) as avg_velocity,
+            AVG(SpinRate) as avg_spin_rate,
+            AVG(InducedVertBreak) as avg_ivb,
+            AVG(HorzBreak) as avg_hb,
+            AVG(RelSide) as avg_rel_side,
+            AVG(RelHeight) as avg_rel_height,
+            AVG(Extension) as avg_extension,
+            COUNT(*) as pitch_count
+        """
+        
+        # Same filters as get_college_averages, grouped instead of one query per combination
+        query = f"""
+        SELECT TaggedPitchType as pitch_type, Level as comparison_level, PitcherThrows as pitcher_throws,
+            {metrics}
+        FROM `NCAABaseball.2025Final`
+        WHERE Level IN ('D1', 'D2', 'D3')
+        AND RelSpeed IS NOT NULL
+        AND SpinRate IS NOT NULL
+        GROUP BY TaggedPitchType, Level, PitcherThrows
+        UNION ALL
+        SELECT TaggedPitchType as pitch_type, 'SEC' as comparison_level, PitcherThrows as pitcher_throws,
+            {metrics}
+        FROM `NCAABaseball.2025Final`
+        WHERE League = 'SEC'
+        AND RelSpeed IS NOT NULL
+        AND SpinRate IS NOT NULL
+        GROUP BY TaggedPitchType, PitcherThrows
+        """
+        
+        result = client.query(query)
+        
+        for row in result:
+            if row.pitch_type and row.pitcher_throws and row.pitch_count > 0:
+                key = (row.pitch_type, row.comparison_level, row.pitcher_throws)
+                college_averages_cache.set(key, college_averages_from_row(row))
+        
+        college_averages_preloaded.set('all', True)
+        
+    except Exception as e:
+        print(f"Error preloading college averages: {str(e)}")
+
 def get_college_percentile_data(pitch_type, comparison_level='D1', pitcher_throws='Right'):
     """Get college baseball data for percentile calculations"""
     try:
@@ -178,6 +675,10 @@ def get_college_percentile_data(pitch_type, comparison_level='D1', pitcher_throw
             if row.Extension is not None:
                 data['extension'].append(float(row.Extension))
         
+        # Sort once here so every percentile lookup against this data is a binary search
+        for values in data.values():
+            values.sort()
+        
         return data if any(len(values) > 0 for values in data.values()) else None
         
     except Exception as e:
@@ -219,6 +720,8 @@ def get_college_max_velocity_percentile_data(pitch_type, comparison_level='D1',
             if row.max_velo is not None:
                 max_velocities.append(float(row.max_velo))
         
+        max_velocities.sort()
+        
         return max_velocities if len(max_velocities) > 0 else None
         
     except Exception as e:
@@ -226,13 +729,16 @@ def get_college_max_velocity_percentile_data(pitch_type, comparison_level='D1',
         return None
 
 def calculate_percentile_rank(player_value, college_data_list, metric_name=None, pitch_type=None, pitcher_throws=None):
-    """Calculate what percentile the player's value falls into compared to college population"""
+    """Calculate what percentile the player's value falls into compared to college population.
+    
+    college_data_list must be sorted ascending (get_college_percentile_data sorts it).
+    """
     if player_value is None or not college_data_list or len(college_data_list) == 0:
         return None
     
-    sorted_college_data = sorted(college_data_list)
-    total_count = len(sorted_college_data)
-    values_below = sum(1 for value in sorted_college_data if value < player_value)
+    # Binary search on the sorted list instead of counting every value below the player's value
+    total_count = len(college_data_list)
+    values_below = bisect_left(college_data_list, player_value)
     raw_percentile = (values_below / total_count) * 100
     
     # Determine if this percentile represents "better" performance using existing logic
@@ -313,6 +819,31 @@ def calculate_percentile(value, comparison_value, metric_name=None, pitch_type=N
         'better': better
     }
 
+# Gzip responses that carry SVG plots / pitch data (highly compressible text)
+GZIP_MIMETYPES = {'application/json', 'image/svg+xml', 'text/html'}
+GZIP_MIN_SIZE = 500  # bytes; smaller bodies aren't worth compressing
+
+@app.after_request
+def compress_response(response):
+    """Gzip-compress text responses when the client accepts it"""
+    if response.mimetype not in GZIP_MIMETYPES:
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    
+    if (response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or 'gzip' not in request.headers.get('Accept-Encoding', '').lower()):
+        return response
+    
+    data = response.get_data()
+    if len(data) < GZIP_MIN_SIZE:
+        return response
+    
+    response.set_data(gzip.compress(data, compresslevel=6))
+    response.headers['Content-Encoding'] = 'gzip'
+    return response
+
 @app.route('/')
 def index():
     """Serve the main HTML page"""
@@ -360,37 +891,27 @@ def get_pitchers():
         return jsonify({'error': 'Date parameter is required'}), 400
     
     try:
-        # First, let's check what the actual date format is in the table
-        debug_query = """
-        SELECT DISTINCT Date, TYPEOF(Date) as date_type
-        FROM `V1PBR.Test`
-        WHERE Date IS NOT NULL
-        LIMIT 5
-        """
+        date_predicate, date_parameter = date_filter(selected_date)
         
-        debug_result = client.query(debug_query)
-        print("Debug - Date formats in table:")
-        for row in debug_result:
-            print(f"Date: {row.Date}, Type: {row.date_type}")
-        
-        # Try different date matching approaches
-        query = """
+        query = f"""
         SELECT DISTINCT Pitcher
         FROM `V1PBR.Test`
-        WHERE CAST(Date AS STRING) = @date
+        WHERE {date_predicate}
         AND Pitcher IS NOT NULL
         ORDER BY Pitcher
         """
         
         job_config = bigquery.QueryJobConfig(
-            query_parameters=[
-                bigquery.ScalarQueryParameter("date", "STRING", selected_date),
-            ]
+            query_parameters=[date_parameter]
         )
         
         result = client.query(query, job_config=job_config)
         pitchers = [row.Pitcher for row in result]
         
+        # The next requests are usually for these pitchers' details; load them all now
+        if pitchers:
+            start_pitch_data_prefetch(selected_date)
+        
         return jsonify({'pitchers': pitchers})
     
     except Exception as e:
@@ -409,27 +930,7 @@ def get_pitcher_details():
         return jsonify({'error': 'Date and pitcher parameters are required'}), 400
     
     try:
-        query = """
-        SELECT *
-        FROM `V1PBR.Test`
-        WHERE CAST(Date AS STRING) = @date
-        AND Pitcher = @pitcher
-        ORDER BY PitchNo
-        """
-        
-        job_config = bigquery.QueryJobConfig(
-            query_parameters=[
-                bigquery.ScalarQueryParameter("date", "STRING", selected_date),
-                bigquery.ScalarQueryParameter("pitcher", "STRING", pitcher_name),
-            ]
-        )
-        
-        result = client.query(query, job_config=job_config)
-        
-        # Convert to list of dictionaries
-        pitch_data = []
-        for row in result:
-            pitch_data.append(dict(row))
+        pitch_data = get_pitcher_pitch_data(selected_date, pitcher_name)
         
         return jsonify({'pitch_data': pitch_data})
     
@@ -443,90 +944,81 @@ def get_stats():
         return jsonify({'error': 'BigQuery client not initialized'}), 500
     
     try:
-        # Get total record count
-        count_query = "SELECT COUNT(*) as total FROM `V1PBR.Test`"
-        count_result = client.query(count_query)
-        total_records = list(count_result)[0].total
-        
-        # Get date range
-        date_range_query = """
+        # Dataset stats plus the Test/Info matching analysis in one query: the name
+        # matching is a FULL JOIN in BigQuery, so only the name lists and counts come back
+        # (date stats only count rows that have a Date; Info rows are grouped by name)
+        stats_query = """
+        WITH test_stats AS (
+            SELECT 
+                COUNT(*) as total,
+                MIN(CAST(Date AS STRING)) as earliest_date,
+                MAX(CAST(Date AS STRING)) as latest_date,
+                COUNT(DISTINCT CAST(Date AS STRING)) as unique_dates,
+                COUNT(DISTINCT IF(Date IS NOT NULL, Pitcher, NULL)) as unique_pitchers
+            FROM `V1PBR.Test`
+        ),
+        test_pitchers AS (
+            SELECT DISTINCT Pitcher
+            FROM `V1PBR.Test`
+            WHERE Pitcher IS NOT NULL
+        ),
+        info_names AS (
+            SELECT 
+                Prospect,
+                COUNTIF(Email IS NOT NULL AND Email != '') as with_email,
+                COUNTIF(Email IS NULL OR Email = '') as without_email
+            FROM `V1PBRInfo.Info`
+            GROUP BY Prospect
+        ),
+        matching AS (
+            SELECT 
+                COALESCE(t.Pitcher, i.Prospect) as name,
+                t.Pitcher IS NOT NULL as in_test,
+                i.with_email IS NOT NULL as in_info,
+                i.with_email,
+                i.without_email
+            FROM test_pitchers t
+            FULL OUTER JOIN info_names i ON t.Pitcher = i.Prospect
+        )
         SELECT 
-            MIN(CAST(Date AS STRING)) as earliest_date,
-            MAX(CAST(Date AS STRING)) as latest_date,
-            COUNT(DISTINCT CAST(Date AS STRING)) as unique_dates,
-            COUNT(DISTINCT Pitcher) as unique_pitchers
-        FROM `V1PBR.Test`
-        WHERE Date IS NOT NULL
-        """
-        
-        date_result = client.query(date_range_query)
-        date_info = list(date_result)[0]
-        
-        # Get matching analysis between Test and Info tables
-        # Get all pitchers from Test table
-        test_pitchers_query = """
-        SELECT DISTINCT Pitcher
-        FROM `V1PBR.Test`
-        WHERE Pitcher IS NOT NULL
-        ORDER BY Pitcher
-        """
-        
-        test_result = client.query(test_pitchers_query)
-        test_pitchers = set([row.Pitcher for row in test_result])
-        
-        # Get all prospects from Info table
-        info_prospects_query = """
-        SELECT Event, Prospect, Email, Type
-        FROM `V1PBRInfo.Info`
-        ORDER BY Prospect
+            s.*,
+            m.*
+        FROM test_stats s
+        CROSS JOIN (
+            SELECT 
+                COUNTIF(in_info) as total_in_info,
+                COUNTIF(in_test) as total_in_test,
+                COUNTIF(in_test AND in_info) as matched_names,
+                IFNULL(SUM(IF(in_test AND in_info, with_email, 0)), 0) as matched_with_email,
+                IFNULL(SUM(IF(in_test AND in_info, without_email, 0)), 0) as matched_without_email,
+                COUNTIF(in_test AND NOT in_info) as in_test_only,
+                COUNTIF(in_info AND NOT in_test) as in_info_only,
+                ARRAY_AGG(IF(in_test AND NOT in_info, name, NULL) IGNORE NULLS ORDER BY name) as test_only_names,
+                ARRAY_AGG(IF(in_info AND NOT in_test, name, NULL) IGNORE NULLS ORDER BY name) as info_only_names,
+                ARRAY_AGG(IF(in_test AND in_info, name, NULL) IGNORE NULLS ORDER BY name) as matched_names_list
+            FROM matching
+        ) m
         """
         
-        info_result = client.query(info_prospects_query)
-        info_prospects = []
-        info_prospect_names = set()
-        
-        for row in info_result:
-            info_prospects.append({
-                'name': row.Prospect,
-                'email': row.Email,
-                'type': row.Type,
-                'event': row.Event
-            })
-            info_prospect_names.add(row.Prospect)
-        
-        # Find matches and mismatches
-        matched_names = test_pitchers.intersection(info_prospect_names)
-        test_only = test_pitchers - info_prospect_names  # In Test but not in Info
-        info_only = info_prospect_names - test_pitchers  # In Info but not in Test
-        
-        # Get email info for matched prospects
-        matched_with_email = 0
-        matched_without_email = 0
-        
-        for prospect in info_prospects:
-            if prospect['name'] in matched_names:
-                if prospect['email']:
-                    matched_with_email += 1
-                else:
-                    matched_without_email += 1
+        stats = next(iter(client.query(stats_query)))
         
         return jsonify({
-            'total_records': total_records,
-            'earliest_date': date_info.earliest_date,
-            'latest_date': date_info.latest_date,
-            'unique_dates': date_info.unique_dates,
-            'unique_pitchers': date_info.unique_pitchers,
+            'total_records': stats.total,
+            'earliest_date': stats.earliest_date,
+            'latest_date': stats.latest_date,
+            'unique_dates': stats.unique_dates,
+            'unique_pitchers': stats.unique_pitchers,
             'matching_stats': {
-                'total_in_info': len(info_prospect_names),
-                'total_in_test': len(test_pitchers),
-                'matched_names': len(matched_names),
-                'matched_with_email': matched_with_email,
-                'matched_without_email': matched_without_email,
-                'in_test_only': len(test_only),
-                'in_info_only': len(info_only),
-                'test_only_names': list(test_only),
-                'info_only_names': list(info_only),
-                'matched_names_list': list(matched_names)
+                'total_in_info': stats.total_in_info,
+                'total_in_test': stats.total_in_test,
+                'matched_names': stats.matched_names,
+                'matched_with_email': stats.matched_with_email,
+                'matched_without_email': stats.matched_without_email,
+                'in_test_only': stats.in_test_only,
+                'in_info_only': stats.in_info_only,
+                'test_only_names': list(stats.test_only_names),
+                'info_only_names': list(stats.info_only_names),
+                'matched_names_list': list(stats.matched_names_list)
             }
         })
     
@@ -548,23 +1040,7 @@ def get_pitcher_summary():
     
     try:
         # Get pitcher's detailed data
-        query = """
-        SELECT *
-        FROM `V1PBR.Test`
-        WHERE CAST(Date AS STRING) = @date
-        AND Pitcher = @pitcher
-        ORDER BY PitchNo
-        """
-        
-        job_config = bigquery.QueryJobConfig(
-            query_parameters=[
-                bigquery.ScalarQueryParameter("date", "STRING", selected_date),
-                bigquery.ScalarQueryParameter("pitcher", "STRING", pitcher_name),
-            ]
-        )
-        
-        result = client.query(query, job_config=job_config)
-        pitch_data = [dict(row) for row in result]
+        pitch_data = get_pitcher_pitch_data(selected_date, pitcher_name)
         
         if not pitch_data:
             return jsonify({'error': 'No pitch data found'}), 404
@@ -573,14 +1049,10 @@ def get_pitcher_summary():
         comparison_level = get_pitcher_competition_level(pitcher_name)
         
         # Determine pitcher handedness
-        pitcher_throws = 'Right'
-        for pitch in pitch_data:
-            if pitch.get('PitcherThrows'):
-                pitcher_throws = pitch.get('PitcherThrows')
-                break
+        pitcher_throws = next((throws for pitch in pitch_data if (throws := pitch.get('PitcherThrows'))), 'Right')
         
         # Generate multi-level comparisons using the pitcher's competition level
-        multi_level_stats = get_multi_level_comparisons(pitch_data, pitcher_throws)
+        multi_level_stats = get_multi_level_comparisons(pitch_data, pitcher_throws, comparison_level)
         
         # Generate movement plot
         movement_plot_svg = generate_movement_plot_svg(pitch_data)
@@ -613,43 +1085,36 @@ def get_matched_prospects():
         return jsonify({'error': 'Date parameter is required'}), 400
     
     try:
+        date_predicate, date_parameter = date_filter(selected_date)
+        
         # Get pitchers for the selected date
-        pitchers_query = """
+        pitchers_query = f"""
         SELECT DISTINCT Pitcher
         FROM `V1PBR.Test`
-        WHERE CAST(Date AS STRING) = @date
+        WHERE {date_predicate}
         AND Pitcher IS NOT NULL
         ORDER BY Pitcher
         """
         
         job_config = bigquery.QueryJobConfig(
-            query_parameters=[
-                bigquery.ScalarQueryParameter("date", "STRING", selected_date),
-            ]
+            query_parameters=[date_parameter]
         )
         
         pitchers_result = client.query(pitchers_query, job_config=job_config)
-        pitchers_from_test = [row.Pitcher for row in pitchers_result]
+        # A set, so checking each prospect is a hash lookup rather than a list scan
+        pitchers_from_test = {row.Pitcher for row in pitchers_result}
         
         # Get prospect info from Info table
-        prospects_query = """
-        SELECT Event, Prospect, Email, Type, Comp
-        FROM `V1PBRInfo.Info`
-        WHERE Prospect IS NOT NULL
-        ORDER BY Prospect
-        """
-        
-        prospects_result = client.query(prospects_query)
         matched_prospects = []
         
-        for row in prospects_result:
-            if row.Prospect in pitchers_from_test:
+        for row in get_prospects():
+            if row['Prospect'] is not None and row['Prospect'] in pitchers_from_test:
                 matched_prospects.append({
-                    'name': row.Prospect,
-                    'email': row.Email,
-                    'type': row.Type,
-                    'event': row.Event,
-                    'comp': row.Comp or 'D1'
+                    'name': row['Prospect'],
+                    'email': row['Email'],
+                    'type': row['Type'],
+                    'event': row['Event'],
+                    'comp': row['Comp'] or 'D1'
                 })
         
         return jsonify({'prospects': matched_prospects})
@@ -701,7 +1166,7 @@ def get_college_zone_rates(pitch_type, comparison_level='D1', pitcher_throws='Ri
         )
         
         result = client.query(strike_zone_query, job_config=job_config)
-        row = list(result)[0] if result else None
+        row = next(iter(result), None)
         
         if row and row.pitch_count > 0:
             return {
@@ -755,7 +1220,7 @@ def get_overall_college_zone_rate(comparison_level='D1', pitcher_throws='Right')
         )
         
         result = client.query(overall_zone_query, job_config=job_config)
-        row = list(result)[0] if result else None
+        row = next(iter(result), None)
         
         if row and row.pitch_count > 0:
             return float(row.avg_zone_rate) if row.avg_zone_rate else None
@@ -789,7 +1254,7 @@ def calculate_zone_rates(pitch_data, comparison_level='D1', pitcher_throws='Righ
                     strike_zone['ymin'] <= plate_height_float <= strike_zone['ymax'])
         
         # Group pitches by type and calculate zone rates
-        pitch_type_data = {}
+        pitch_type_data = defaultdict(lambda: {'total': 0, 'in_zone': 0})
         total_pitches = 0
         total_in_zone = 0
         
@@ -808,15 +1273,10 @@ def calculate_zone_rates(pitch_data, comparison_level='D1', pitcher_throws='Righ
             if in_zone:
                 total_in_zone += 1
             
-            if pitch_type not in pitch_type_data:
-                pitch_type_data[pitch_type] = {
-                    'total': 0,
-                    'in_zone': 0
-                }
-            
-            pitch_type_data[pitch_type]['total'] += 1
+            type_counts = pitch_type_data[pitch_type]
+            type_counts['total'] += 1
             if in_zone:
-                pitch_type_data[pitch_type]['in_zone'] += 1
+                type_counts['in_zone'] += 1
         
         # Calculate zone rate percentages for each pitch type WITH college comparisons
         zone_rates = {}
@@ -877,30 +1337,21 @@ def generate_pitch_location_plot_svg(pitch_data, width=700, height=600):
 
     try:
         # Group pitches by type
-        pitch_types = {}
+        pitch_types = defaultdict(list)
         for pitch in pitch_data:
-            pitch_type = pitch.get('TaggedPitchType')
-            if pitch_type and pitch.get('PlateLocSide') is not None and pitch.get('PlateLocHeight') is not None:
-                if pitch_type not in pitch_types:
-                    pitch_types[pitch_type] = []
+            get = pitch.get
+            pitch_type = get('TaggedPitchType')
+            plate_side = get('PlateLocSide')
+            plate_height = get('PlateLocHeight')
+            if pitch_type and plate_side is not None and plate_height is not None:
                 pitch_types[pitch_type].append({
-                    'plate_side': -1 * float(pitch.get('PlateLocSide', 0)),  # Flip for batter's perspective
-                    'plate_height': float(pitch.get('PlateLocHeight', 0))
+                    'plate_side': -1 * float(plate_side),  # Flip for batter's perspective
+                    'plate_height': float(plate_height)
                 })
         
         if not pitch_types:
             return None
         
-        # Define colors for pitch types (same as movement plot)
-        colors = {
-            'ChangeUp': '#059669', 'Curveball': '#1D4ED8', 'Cutter': '#BE185D',
-            'Fastball': '#DC2626', 'Knuckleball': '#9333EA', 'Sinker': '#EA580C',
-            'Slider': '#7C3AED', 'Splitter': '#0891B2', 'Sweeper': '#F59E0B',
-            'Four-Seam': '#DC2626', '4-Seam': '#DC2626', 'Two-Seam': '#EA580C',
-            'TwoSeam': '#EA580C', 'Changeup': '#059669', 'Change-up': '#059669',
-            'Curve': '#1D4ED8', 'Cut Fastball': '#BE185D', 'Split-Finger': '#0891B2'
-        }
-        
         # Set up plot dimensions - wider with space for 3D effect
         margin_left = 60
         margin_right = 150  # Space for legend and 3D effect
@@ -960,20 +1411,7 @@ def generate_pitch_location_plot_svg(pitch_data, width=700, height=600):
         # Start SVG
         svg_parts = [
             f'<svg width="{width}" height="{height}" xmlns="http://www.w3.org/2000/svg">',
-            '<defs>',
-            '<style>',
-            '.strike-zone { stroke: black; stroke-width: 2; fill: none; }',
-            '.shadow-zone { stroke: black; stroke-width: 1; fill: none; stroke-dasharray: 3,3; }',
-            '.home-plate-base { stroke: black; stroke-width: 1; fill: #f0f0f0; }',
-            '.home-plate-top { stroke: black; stroke-width: 2; fill: white; }',
-            '.plate-connector { stroke: black; stroke-width: 1; }',
-            '.batter-box { stroke: black; stroke-width: 3; fill: none; }',
-            '.axis-text { font-family: Arial, sans-serif; font-size: 10px; fill: black; }',
-            '.plot-title { font-family: Arial, sans-serif; font-size: 16px; font-weight: bold; fill: #1a1a1a; text-anchor: start; }',
-            '.plot-subtitle { font-family: Arial, sans-serif; font-size: 12px; fill: #666666; text-anchor: start; font-style: italic; }',
-            '.legend-text { font-family: Arial, sans-serif; font-size: 9px; fill: black; }',
-            '</style>',
-            '</defs>',
+            LOCATION_PLOT_DEFS,
             
             # White background
             f'<rect width="{width}" height="{height}" fill="white"/>',
@@ -981,8 +1419,8 @@ def generate_pitch_location_plot_svg(pitch_data, width=700, height=600):
         
         # Title and subtitle
         svg_parts.extend([
-            f'<text x="{margin_left}" y="25" class="plot-title">Pitch Location</text>',
-            f'<text x="{margin_left}" y="40" class="plot-subtitle">Batter\'s Perspective</text>'
+            f'<text x="{margin_left}" y="25" class="pt">Pitch Location</text>',
+            f'<text x="{margin_left}" y="40" class="ps">Batter\'s Perspective</text>'
         ])
         
         # Draw larger strike zone (shadow zone)
@@ -991,7 +1429,7 @@ def generate_pitch_location_plot_svg(pitch_data, width=700, height=600):
         larger_bottom = scale_y(larger_strike_zone['ymin'])
         larger_top = scale_y(larger_strike_zone['ymax'])
         
-        svg_parts.append(f'<rect x="{larger_left}" y="{larger_top}" width="{larger_right - larger_left}" height="{larger_bottom - larger_top}" class="shadow-zone"/>')
+        svg_parts.append(f'<rect x="{larger_left}" y="{larger_top}" width="{larger_right - larger_left}" height="{larger_bottom - larger_top}" class="sh"/>')
         
         # Draw main strike zone
         zone_left = scale_x(strike_zone['xmin'])
@@ -999,7 +1437,7 @@ def generate_pitch_location_plot_svg(pitch_data, width=700, height=600):
         zone_bottom = scale_y(strike_zone['ymin'])
         zone_top = scale_y(strike_zone['ymax'])
         
-        svg_parts.append(f'<rect x="{zone_left}" y="{zone_top}" width="{zone_right - zone_left}" height="{zone_bottom - zone_top}" class="strike-zone"/>')
+        svg_parts.append(f'<rect x="{zone_left}" y="{zone_top}" width="{zone_right - zone_left}" height="{zone_bottom - zone_top}" class="sz"/>')
         
         # Draw strike zone grid lines (thirds)
         # Horizontal lines
@@ -1019,19 +1457,19 @@ def generate_pitch_location_plot_svg(pitch_data, width=700, height=600):
         base_points = []
         for x, y in home_plate_base:
             base_points.append(f"{scale_x(x)},{scale_y(y)}")
-        svg_parts.append(f'<polygon points="{" ".join(base_points)}" class="home-plate-base"/>')
+        svg_parts.append(f'<polygon points="{" ".join(base_points)}" class="hpb"/>')
         
         # Draw lifted plate (top layer)
         lifted_points = []
         for x, y in home_plate_lifted:
             lifted_points.append(f"{scale_x(x)},{scale_y(y)}")
-        svg_parts.append(f'<polygon points="{" ".join(lifted_points)}" class="home-plate-top"/>')
+        svg_parts.append(f'<polygon points="{" ".join(lifted_points)}" class="hpt"/>')
         
         # Draw connecting lines for 3D effect (like the R code segments)
         for i in range(len(home_plate_base)):
             x1, y1 = home_plate_base[i]
             x2, y2 = home_plate_lifted[i]
-            svg_parts.append(f'<line x1="{scale_x(x1)}" y1="{scale_y(y1)}" x2="{scale_x(x2)}" y2="{scale_y(y2)}" class="plate-connector"/>')
+            svg_parts.append(f'<line x1="{scale_x(x1)}" y1="{scale_y(y1)}" x2="{scale_x(x2)}" y2="{scale_y(y2)}" class="pc"/>')
         
         # Draw batter's boxes with 3D effect (like R code)
         # Right batter's box
@@ -1059,7 +1497,7 @@ def generate_pitch_location_plot_svg(pitch_data, width=700, height=600):
         
         # Plot pitch locations
         for pitch_type, pitches in pitch_types.items():
-            color = colors.get(pitch_type, '#666666')
+            color = PITCH_COLORS.get(pitch_type, '#666666')
             
             for pitch in pitches:
                 x_pos = scale_x(pitch['plate_side'])
@@ -1073,38 +1511,38 @@ def generate_pitch_location_plot_svg(pitch_data, width=700, height=600):
         legend_y = margin_top + 50
         
         # Pitch type legend
-        svg_parts.append(f'<text x="{legend_x}" y="{legend_y}" class="legend-text" style="font-weight: bold;">Pitch Types:</text>')
+        svg_parts.append(f'<text x="{legend_x}" y="{legend_y}" class="lt" style="font-weight: bold;">Pitch Types:</text>')
         current_y = legend_y + 15
         
         for pitch_type in pitch_types.keys():
-            color = colors.get(pitch_type, '#666666')
+            color = PITCH_COLORS.get(pitch_type, '#666666')
             svg_parts.extend([
                 f'<circle cx="{legend_x + 5}" cy="{current_y}" r="3" fill="{color}"/>',
-                f'<text x="{legend_x + 15}" y="{current_y + 3}" class="legend-text">{pitch_type}</text>'
+                f'<text x="{legend_x + 15}" y="{current_y + 3}" class="lt">{pitch_type}</text>'
             ])
             current_y += 15
         
         # Add axis labels
         # X-axis label
         x_center = margin_left + plot_width/2
-        svg_parts.append(f'<text x="{x_center}" y="{height - 20}" class="axis-text" text-anchor="middle" style="font-weight: bold;">Plate Location - Side (ft)</text>')
+        svg_parts.append(f'<text x="{x_center}" y="{height - 20}" class="at" text-anchor="middle" style="font-weight: bold;">Plate Location - Side (ft)</text>')
         
         # Y-axis label
         y_center = margin_top + plot_height/2
-        svg_parts.append(f'<text x="20" y="{y_center}" class="axis-text" text-anchor="middle" style="font-weight: bold;" transform="rotate(-90, 20, {y_center})">Plate Location - Height (ft)</text>')
+        svg_parts.append(f'<text x="20" y="{y_center}" class="at" text-anchor="middle" style="font-weight: bold;" transform="rotate(-90, 20, {y_center})">Plate Location - Height (ft)</text>')
         
         # Add tick marks and labels
         # X-axis ticks
         for x in [-3, -2, -1, 0, 1, 2, 3]:
             x_pos = scale_x(x)
             svg_parts.append(f'<line x1="{x_pos}" y1="{margin_top + plot_height}" x2="{x_pos}" y2="{margin_top + plot_height + 5}" stroke="black" stroke-width="1"/>')
-            svg_parts.append(f'<text x="{x_pos}" y="{margin_top + plot_height + 18}" class="axis-text" text-anchor="middle">{x}</text>')
+            svg_parts.append(f'<text x="{x_pos}" y="{margin_top + plot_height + 18}" class="at" text-anchor="middle">{x}</text>')
         
         # Y-axis ticks
         for y in [0, 1, 2, 3, 4, 5]:
             y_pos = scale_y(y)
             svg_parts.append(f'<line x1="{margin_left - 5}" y1="{y_pos}" x2="{margin_left}" y2="{y_pos}" stroke="black" stroke-width="1"/>')
-            svg_parts.append(f'<text x="{margin_left - 10}" y="{y_pos + 3}" class="axis-text" text-anchor="end">{y}</text>')
+            svg_parts.append(f'<text x="{margin_left - 10}" y="{y_pos + 3}" class="at" text-anchor="end">{y}</text>')
         
         # Close SVG
         svg_parts.append('</svg>')
@@ -1120,32 +1558,25 @@ def generate_movement_plot_svg(pitch_data, width=1000, height=500):
     """Generate SVG for both movement plot (left) and release plot (right)"""
     try:
         # Group pitches by type
-        pitch_types = {}
+        pitch_types = defaultdict(list)
         for pitch in pitch_data:
-            pitch_type = pitch.get('TaggedPitchType')
-            if pitch_type and pitch.get('HorzBreak') is not None and pitch.get('InducedVertBreak') is not None:
-                if pitch_type not in pitch_types:
-                    pitch_types[pitch_type] = []
+            get = pitch.get  # Avoid repeated attribute lookups in this hot loop
+            pitch_type = get('TaggedPitchType')
+            hb = get('HorzBreak')
+            ivb = get('InducedVertBreak')
+            if pitch_type and hb is not None and ivb is not None:
+                rel_side = get('RelSide')
+                rel_height = get('RelHeight')
                 pitch_types[pitch_type].append({
-                    'hb': float(pitch.get('HorzBreak', 0)),
-                    'ivb': float(pitch.get('InducedVertBreak', 0)),
-                    'rel_side': float(pitch.get('RelSide', 0)) if pitch.get('RelSide') is not None else None,
-                    'rel_height': float(pitch.get('RelHeight', 0)) if pitch.get('RelHeight') is not None else None
+                    'hb': float(hb),
+                    'ivb': float(ivb),
+                    'rel_side': float(rel_side) if rel_side is not None else None,
+                    'rel_height': float(rel_height) if rel_height is not None else None
                 })
         
         if not pitch_types:
             return None
         
-        # Define colors for pitch types
-        colors = {
-            'ChangeUp': '#059669', 'Curveball': '#1D4ED8', 'Cutter': '#BE185D',
-            'Fastball': '#DC2626', 'Knuckleball': '#9333EA', 'Sinker': '#EA580C',
-            'Slider': '#7C3AED', 'Splitter': '#0891B2', 'Sweeper': '#F59E0B',
-            'Four-Seam': '#DC2626', '4-Seam': '#DC2626', 'Two-Seam': '#EA580C',
-            'TwoSeam': '#EA580C', 'Changeup': '#059669', 'Change-up': '#059669',
-            'Curve': '#1D4ED8', 'Cut Fastball': '#BE185D', 'Split-Finger': '#0891B2'
-        }
-        
         # Function to calculate 95% confidence ellipse (only for movement plot)
         def calculate_confidence_ellipse(x_values, y_values, confidence=0.95):
             if len(x_values) < 3:
@@ -1153,16 +1584,22 @@ def generate_movement_plot_svg(pitch_data, width=1000, height=500):
             
             import math
             
-            x_mean = sum(x_values) / len(x_values)
-            y_mean = sum(y_values) / len(y_values)
-            
-            x_diff = [x - x_mean for x in x_values]
-            y_diff = [y - y_mean for y in y_values]
             n = len(x_values)
+            x_mean = sum(x_values) / n
+            y_mean = sum(y_values) / n
+            
+            # Accumulate the covariance sums in one pass over the points
+            sum_xx = sum_xy = sum_yy = 0.0
+            for x, y in zip(x_values, y_values):
+                dx = x - x_mean
+                dy = y - y_mean
+                sum_xx += dx * dx
+                sum_xy += dx * dy
+                sum_yy += dy * dy
             
-            cov_xx = sum(x * x for x in x_diff) / (n - 1)
-            cov_xy = sum(x * y for x, y in zip(x_diff, y_diff)) / (n - 1)
-            cov_yy = sum(y * y for y in y_diff) / (n - 1)
+            cov_xx = sum_xx / (n - 1)
+            cov_xy = sum_xy / (n - 1)
+            cov_yy = sum_yy / (n - 1)
             
             trace = cov_xx + cov_yy
             det = cov_xx * cov_yy - cov_xy * cov_xy
@@ -1243,21 +1680,7 @@ def generate_movement_plot_svg(pitch_data, width=1000, height=500):
         # Start SVG
         svg_parts = [
             f'<svg width="{width}" height="{height}" xmlns="http://www.w3.org/2000/svg">',
-            '<defs>',
-            '<style>',
-            '.axis-line { stroke: #990000; stroke-width: 2; }',
-            '.grid-line { stroke: rgba(0,0,0,0.2); stroke-width: 1; }',
-            '.axis-text { font-family: Arial, sans-serif; font-size: 10px; fill: black; }',
-            '.axis-title { font-family: Arial, sans-serif; font-size: 12px; font-weight: bold; fill: black; }',
-            '.legend-text { font-family: Arial, sans-serif; font-size: 9px; fill: black; }',
-            '.plot-title { font-family: Arial, sans-serif; font-size: 14px; font-weight: bold; fill: #1a1a1a; text-anchor: start; }',
-            '.plot-subtitle { font-family: Arial, sans-serif; font-size: 10px; fill: #666666; text-anchor: start; font-style: italic; }',
-            '.plot-border { stroke: black; stroke-width: 2; fill: none; }',
-            '.confidence-ellipse { fill: none; stroke-width: 1.5; stroke-opacity: 0.7; }',
-            '.home-plate { stroke: #990000; stroke-width: 2; fill: white; }',
-            '.release-text { font-family: Arial, sans-serif; font-size: 12px; font-weight: bold; fill: #990000; text-anchor: middle; }',
-            '</style>',
-            '</defs>',
+            MOVEMENT_PLOT_DEFS,
             
             # White background
             f'<rect width="{width}" height="{height}" fill="white"/>',
@@ -1266,65 +1689,65 @@ def generate_movement_plot_svg(pitch_data, width=1000, height=500):
         # === MOVEMENT PLOT (LEFT) ===
         
         # Movement plot titles (left-aligned)
-        svg_parts.append(f'<text x="{mov_x_start}" y="20" class="plot-title">Movement Profile</text>')
-        svg_parts.append(f'<text x="{mov_x_start}" y="32" class="plot-subtitle">Pitcher\'s Perspective</text>')
+        svg_parts.append(f'<text x="{mov_x_start}" y="20" class="pt">Movement Profile</text>')
+        svg_parts.append(f'<text x="{mov_x_start}" y="32" class="ps">Pitcher\'s Perspective</text>')
         
         # Movement plot grid
         for x in range(-25, 31, 5):  # Every 5 units like before
             x_pos = scale_mov_x(x)
-            line_class = 'axis-line' if x == 0 else 'grid-line'
+            line_class = 'al' if x == 0 else 'gl'
             svg_parts.append(f'<line x1="{x_pos}" y1="{mov_y_start}" x2="{x_pos}" y2="{mov_y_start + plot_height}" class="{line_class}"/>')
             if x != 0:
-                svg_parts.append(f'<text x="{x_pos}" y="{mov_y_start + plot_height + 15}" class="axis-text" text-anchor="middle">{x}</text>')
+                svg_parts.append(f'<text x="{x_pos}" y="{mov_y_start + plot_height + 15}" class="at" text-anchor="middle">{x}</text>')
         
         for y in range(-25, 31, 5):  # Every 5 units like before
             y_pos = scale_mov_y(y)
-            line_class = 'axis-line' if y == 0 else 'grid-line'
+            line_class = 'al' if y == 0 else 'gl'
             svg_parts.append(f'<line x1="{mov_x_start}" y1="{y_pos}" x2="{mov_x_start + plot_width}" y2="{y_pos}" class="{line_class}"/>')
             if y != 0:
-                svg_parts.append(f'<text x="{mov_x_start - 10}" y="{y_pos + 3}" class="axis-text" text-anchor="end">{y}</text>')
+                svg_parts.append(f'<text x="{mov_x_start - 10}" y="{y_pos + 3}" class="at" text-anchor="end">{y}</text>')
         
         # Movement plot border
-        svg_parts.append(f'<rect x="{mov_x_start}" y="{mov_y_start}" width="{plot_width}" height="{plot_height}" class="plot-border"/>')
+        svg_parts.append(f'<rect x="{mov_x_start}" y="{mov_y_start}" width="{plot_width}" height="{plot_height}" class="pb"/>')
         
         # Movement plot axis labels (FIXED - use pre-calculated positions)
         svg_parts.extend([
-            f'<text x="{mov_center_x}" y="{mov_bottom_y}" class="axis-title" text-anchor="middle">Horizontal Break (in)</text>',
-            f'<text x="20" y="{mov_left_y}" class="axis-title" text-anchor="middle" transform="rotate(-90, 20, {mov_left_y})">Induced Vertical Break (in)</text>'
+            f'<text x="{mov_center_x}" y="{mov_bottom_y}" class="ax" text-anchor="middle">Horizontal Break (in)</text>',
+            f'<text x="20" y="{mov_left_y}" class="ax" text-anchor="middle" transform="rotate(-90, 20, {mov_left_y})">Induced Vertical Break (in)</text>'
         ])
         
         # === RELEASE PLOT (RIGHT) ===
         
         # Release plot titles (left-aligned)
-        svg_parts.append(f'<text x="{rel_x_start}" y="20" class="plot-title">Release Point</text>')
-        svg_parts.append(f'<text x="{rel_x_start}" y="32" class="plot-subtitle">Pitcher\'s Perspective</text>')
+        svg_parts.append(f'<text x="{rel_x_start}" y="20" class="pt">Release Point</text>')
+        svg_parts.append(f'<text x="{rel_x_start}" y="32" class="ps">Pitcher\'s Perspective</text>')
         
         # Release plot grid
         for x in range(-4, 5, 1):  # Every 1 foot like before
             x_pos = scale_rel_x(x)
-            line_class = 'axis-line' if x == 0 else 'grid-line'
+            line_class = 'al' if x == 0 else 'gl'
             svg_parts.append(f'<line x1="{x_pos}" y1="{rel_y_start}" x2="{x_pos}" y2="{rel_y_start + plot_height}" class="{line_class}"/>')
             if x != 0:
-                svg_parts.append(f'<text x="{x_pos}" y="{rel_y_start + plot_height + 15}" class="axis-text" text-anchor="middle">{x}</text>')
+                svg_parts.append(f'<text x="{x_pos}" y="{rel_y_start + plot_height + 15}" class="at" text-anchor="middle">{x}</text>')
         
         for y in range(1, 8, 1):  # Every 1 foot like before
             y_pos = scale_rel_y(y)
-            svg_parts.append(f'<line x1="{rel_x_start}" y1="{y_pos}" x2="{rel_x_start + plot_width}" y2="{y_pos}" class="grid-line"/>')
-            svg_parts.append(f'<text x="{rel_x_start - 10}" y="{y_pos + 3}" class="axis-text" text-anchor="end">{y}</text>')
+            svg_parts.append(f'<line x1="{rel_x_start}" y1="{y_pos}" x2="{rel_x_start + plot_width}" y2="{y_pos}" class="gl"/>')
+            svg_parts.append(f'<text x="{rel_x_start - 10}" y="{y_pos + 3}" class="at" text-anchor="end">{y}</text>')
         
         # Release plot border
-        svg_parts.append(f'<rect x="{rel_x_start}" y="{rel_y_start}" width="{plot_width}" height="{plot_height}" class="plot-border"/>')
+        svg_parts.append(f'<rect x="{rel_x_start}" y="{rel_y_start}" width="{plot_width}" height="{plot_height}" class="pb"/>')
         
         # Release plot axis labels (FIXED - use pre-calculated positions)
         svg_parts.extend([
-            f'<text x="{rel_center_x}" y="{mov_bottom_y}" class="axis-title" text-anchor="middle">Release Side (ft)</text>',
-            f'<text x="{rel_right_x}" y="{rel_center_y}" class="axis-title" text-anchor="middle" transform="rotate(-90, {rel_right_x}, {rel_center_y})">Release Height (ft)</text>'
+            f'<text x="{rel_center_x}" y="{mov_bottom_y}" class="ax" text-anchor="middle">Release Side (ft)</text>',
+            f'<text x="{rel_right_x}" y="{rel_center_y}" class="ax" text-anchor="middle" transform="rotate(-90, {rel_right_x}, {rel_center_y})">Release Height (ft)</text>'
         ])
         
         # Add LHP/RHP labels to release plot
         svg_parts.extend([
-            f'<text x="{scale_rel_x(-4)}" y="{scale_rel_y(7.5)}" class="release-text">LHP</text>',
-            f'<text x="{scale_rel_x(4)}" y="{scale_rel_y(7.5)}" class="release-text">RHP</text>'
+            f'<text x="{scale_rel_x(-4)}" y="{scale_rel_y(7.5)}" class="rt">LHP</text>',
+            f'<text x="{scale_rel_x(4)}" y="{scale_rel_y(7.5)}" class="rt">RHP</text>'
         ])
         
         # Add home plate to release plot (wider and shorter)
@@ -1332,7 +1755,7 @@ def generate_movement_plot_svg(pitch_data, width=1000, height=500):
         plate_right = scale_rel_x(1.0)  # Extended from 0.7 to 1.0
         plate_top = scale_rel_y(1.0)    # Moved up from 1.2 to 1.0 (shorter)
         plate_bottom = scale_rel_y(0.7) # Moved up from 0.5 to 0.7 (shorter)
-        svg_parts.append(f'<rect x="{plate_left}" y="{plate_top}" width="{plate_right - plate_left}" height="{plate_bottom - plate_top}" class="home-plate"/>')
+        svg_parts.append(f'<rect x="{plate_left}" y="{plate_top}" width="{plate_right - plate_left}" height="{plate_bottom - plate_top}" class="hp"/>')
         
         # Determine pitcher handedness for average release point
         pitcher_throws = 'Right'  # Default
@@ -1351,7 +1774,7 @@ def generate_movement_plot_svg(pitch_data, width=1000, height=500):
         
         # Plot data for both charts
         for pitch_type, pitches in pitch_types.items():
-            color = colors.get(pitch_type, '#666666')
+            color = PITCH_COLORS.get(pitch_type, '#666666')
             
             # Extract coordinates
             hb_values = [p['hb'] for p in pitches]
@@ -1374,7 +1797,7 @@ def generate_movement_plot_svg(pitch_data, width=1000, height=500):
                         else:
                             path_data.append(f'L {x_pos} {y_pos}')
                     path_data.append('Z')
-                    svg_parts.append(f'<path d="{" ".join(path_data)}" class="confidence-ellipse" stroke="{color}"/>')
+                    svg_parts.append(f'<path d="{" ".join(path_data)}" class="ce" stroke="{color}"/>')
             
             # Movement individual points
             for pitch in pitches:
@@ -1382,10 +1805,10 @@ def generate_movement_plot_svg(pitch_data, width=1000, height=500):
                 y_pos = scale_mov_y(pitch['ivb'])
                 svg_parts.append(f'<circle cx="{x_pos}" cy="{y_pos}" r="2.5" fill="{color}" fill-opacity="0.6" stroke="rgba(255,255,255,0.4)" stroke-width="0.5"/>')
             
-            # Movement average point
+            # Movement average point (reuses the extracted value lists)
             if pitches:
-                avg_hb = sum(p['hb'] for p in pitches) / len(pitches)
-                avg_ivb = sum(p['ivb'] for p in pitches) / len(pitches)
+                avg_hb = sum(hb_values) / len(hb_values)
+                avg_ivb = sum(ivb_values) / len(ivb_values)
                 avg_x = scale_mov_x(avg_hb)
                 avg_y = scale_mov_y(avg_ivb)
                 svg_parts.append(f'<circle cx="{avg_x}" cy="{avg_y}" r="5" fill="{color}" stroke="rgba(0,0,0,0.8)" stroke-width="2"/>')
@@ -1406,10 +1829,10 @@ def generate_movement_plot_svg(pitch_data, width=1000, height=500):
         current_legend_y = legend_y_start
         
         for pitch_type in pitch_types.keys():
-            color = colors.get(pitch_type, '#666666')
+            color = PITCH_COLORS.get(pitch_type, '#666666')
             svg_parts.extend([
                 f'<circle cx="{legend_x}" cy="{current_legend_y}" r="3" fill="{color}"/>',
-                f'<text x="{legend_x + 10}" y="{current_legend_y + 3}" class="legend-text">{pitch_type}</text>'
+                f'<text x="{legend_x + 10}" y="{current_legend_y + 3}" class="lt">{pitch_type}</text>'
             ])
             current_legend_y -= 15
         
@@ -1424,6 +1847,7 @@ def generate_movement_plot_svg(pitch_data, width=1000, height=500):
 
 
 # Add this new function to get college max velocity averages
+@ttl_cached(college_max_velocity_averages_cache)
 def get_college_max_velocity_averages(pitch_type, comparison_level='D1', pitcher_throws='Right'):
     """Get college baseball MAX velocity averages for comparison, filtered by pitcher handedness"""
     try:
@@ -1460,7 +1884,7 @@ def get_college_max_velocity_averages(pitch_type, comparison_level='D1', pitcher
         )
         
         result = client.query(query, job_config=job_config)
-        row = list(result)[0] if result else None
+        row = next(iter(result), None)
         
         if row and row.pitcher_count > 0:
             return {
@@ -1478,25 +1902,9 @@ def get_college_max_velocity_averages(pitch_type, comparison_level='D1', pitcher
 def is_horizontal_break_better(difference, pitch_type, pitcher_throws):
     """Determine if horizontal break difference is better based on pitch type and handedness"""
     
-    # Normalize pitch type names for comparison
-    pitch_type_lower = pitch_type.lower()
-    
-    # Define pitch categories based on expected break patterns
-    # These should break away from arm side (glove side break)
-    breaking_balls = ['curveball', 'curve', 'slider', 'cutter', 'cut fastball', 'sweeper']
-    
-    # These should have arm-side run
-    fastballs_and_offspeed = [
-        'fastball', 'four-seam', '4-seam', 'fourseam', 'four seam',
-        'sinker', 'two-seam', '2-seam', 'twoseam', 'two seam',
-        'changeup', 'change-up', 'change up', 'changup',
-        'splitter', 'split-finger', 'splitfinger', 'split finger',
-        'knuckleball', 'knuckle ball'
-    ]
-    
-    # Check if pitch type matches any variation
-    is_breaking_ball = any(pattern in pitch_type_lower for pattern in breaking_balls)
-    is_fastball_or_offspeed = any(pattern in pitch_type_lower for pattern in fastballs_and_offspeed)
+    traits = classify_pitch(pitch_type)
+    is_breaking_ball = traits.breaking
+    is_fastball_or_offspeed = traits.arm_side_run
     
     if pitcher_throws == 'Right':
         if is_breaking_ball:
@@ -1520,22 +1928,7 @@ def is_horizontal_break_better(difference, pitch_type, pitcher_throws):
 def is_ivb_better(difference, pitch_type):
     """Determine if IVB difference is better based on pitch type"""
     
-    # Normalize pitch type names for comparison
-    pitch_type_lower = pitch_type.lower()
-    
-    # Define pitch categories where negative IVB is better (breaking balls and offspeed)
-    negative_ivb_pitches = [
-        'curveball', 'curve', 
-        'changeup', 'change-up', 'change up', 'changup',
-        'splitter', 'split-finger', 'splitfinger', 'split finger',
-        'knuckleball', 'knuckle ball',
-        'sinker', 'two-seam', '2-seam', 'twoseam', 'two seam'  # Added sinker variations
-    ]
-    
-    # Check for matches (using 'in' to catch variations)
-    is_negative_ivb_pitch = any(pattern in pitch_type_lower for pattern in negative_ivb_pitches)
-    
-    if is_negative_ivb_pitch:
+    if classify_pitch(pitch_type).negative_ivb:
         # For these pitches, more negative IVB is better (more drop/sink)
         return difference < 0
     else:
@@ -1545,20 +1938,7 @@ def is_ivb_better(difference, pitch_type):
 def is_velocity_better(difference, pitch_type):
     """Determine if velocity difference is better based on pitch type"""
     
-    # Normalize pitch type names for comparison
-    pitch_type_lower = pitch_type.lower()
-    
-    # Define pitch categories where lower velocity is better (offspeed pitches)
-    lower_velo_pitches = [
-        'changeup', 'change-up', 'change up', 'changup',
-        'splitter', 'split-finger', 'splitfinger', 'split finger',
-        'knuckleball', 'knuckle ball'
-    ]
-    
-    # Check for matches
-    is_lower_velo_pitch = any(pattern in pitch_type_lower for pattern in lower_velo_pitches)
-    
-    if is_lower_velo_pitch:
+    if classify_pitch(pitch_type).lower_velo:
         # For changeups, splitters, and knuckleballs, lower velocity is better
         return difference < 0
     else:
@@ -1568,19 +1948,7 @@ def is_velocity_better(difference, pitch_type):
 def is_spin_rate_better(difference, pitch_type):
     """Determine if spin rate difference is better based on pitch type"""
     
-    # Normalize pitch type names for comparison
-    pitch_type_lower = pitch_type.lower()
-    
-    # Define pitch categories where lower spin rate is better
-    lower_spin_pitches = [
-        'splitter', 'split-finger', 'splitfinger', 'split finger',
-        'knuckleball', 'knuckle ball'  # knuckleballs also benefit from lower spin
-    ]
-    
-    # Check for matches
-    is_lower_spin_pitch = any(pattern in pitch_type_lower for pattern in lower_spin_pitches)
-    
-    if is_lower_spin_pitch:
+    if classify_pitch(pitch_type).lower_spin:
         # For splitters and knuckleballs, lower spin rate is better
         return difference < 0
     else:
@@ -1614,171 +1982,164 @@ def calculate_difference_from_average(pitcher_value, college_average, metric_nam
         'absolute_diff': abs(difference)
     }
 
+# Pitch metrics averaged per pitch type: (summary key, pitch data field)
+PITCH_METRIC_FIELDS = [
+    ('velocity', 'RelSpeed'),
+    ('spin', 'SpinRate'),
+    ('ivb', 'InducedVertBreak'),
+    ('hb', 'HorzBreak'),
+    ('rel_height', 'RelHeight'),
+    ('rel_side', 'RelSide'),
+    ('extension', 'Extension')
+]
+
+def group_pitches_by_type(pitch_data):
+    """Group pitches by TaggedPitchType, in order of first appearance"""
+    pitch_type_data = defaultdict(list)
+    for pitch in pitch_data:
+        pitch_type_data[pitch.get('TaggedPitchType', 'Unknown')].append(pitch)
+    return pitch_type_data
+
+def average_pitch_metrics(pitches):
+    """Average each pitch metric for a group of pitches, plus max velocity"""
+    averages = {}
+    for key, field in PITCH_METRIC_FIELDS:
+        # One .get() per pitch; missing/zero values are skipped
+        values = [value for pitch in pitches if (value := pitch.get(field))]
+        averages[key] = sum(values) / len(values) if values else None
+        if key == 'velocity':
+            averages['max_velocity'] = max(values) if values else None
+    return averages
+
+# Metrics compared against college data, in display order:
+# (key, percentile data key, college average key, metric name for "better" logic, decimals)
+ComparisonMetric = namedtuple('ComparisonMetric', ['key', 'data_key', 'average_key', 'metric_name', 'decimals'])
+COMPARISON_METRICS = [
+    ComparisonMetric('velocity', 'velocity', 'avg_velocity', 'velocity', 1),
+    ComparisonMetric('max_velocity', 'max_velocity', 'avg_max_velocity', 'velocity', 1),
+    ComparisonMetric('spin', 'spin_rate', 'avg_spin_rate', 'spin_rate', 0),
+    ComparisonMetric('ivb', 'ivb', 'avg_ivb', 'ivb', 1),
+    ComparisonMetric('hb', 'hb', 'avg_hb', 'hb', 1),
+    ComparisonMetric('rel_height', 'rel_height', 'avg_rel_height', None, 1),
+    ComparisonMetric('rel_side', 'rel_side', 'avg_rel_side', None, 1),
+    ComparisonMetric('extension', 'extension', 'avg_extension', None, 1),
+]
+# Comparison entries for a level with no college data (shared, treat as read-only)
+EMPTY_METRIC_CELL = {'college_avg': 'N/A', 'comparison': None, 'difference': 'N/A'}
+EMPTY_LEVEL_COMPARISON = {metric.key: EMPTY_METRIC_CELL for metric in COMPARISON_METRICS}
+
+# The PDF breakdown has no max velocity row
+REPORT_METRICS = [metric for metric in COMPARISON_METRICS if metric.key != 'max_velocity']
+
+def build_metric_cell(pitcher_value, percentile_values, college_avg, metric, pitch_type, pitcher_throws):
+    """Build one metric's college average + percentile entry for the multi-level comparison"""
+    comparison = calculate_difference_from_average_with_percentile(
+        pitcher_value,
+        percentile_values,
+        metric_name=metric.metric_name,
+        pitch_type=pitch_type,
+        pitcher_throws=pitcher_throws
+    )
+    return {
+        'college_avg': format_metric(college_avg, metric.decimals),
+        'comparison': comparison,
+        'difference': f"{comparison['difference']:.0f}%" if comparison else 'N/A'
+    }
+
+def format_metric(value, decimals=1):
+    """Format a metric for display, 'N/A' when it's missing (or zero)"""
+    return f"{value:.{decimals}f}" if value else 'N/A'
+
+# Priority order for pitch types in reports - Fastball first, then by general usage/importance
+PITCH_TYPE_PRIORITY = ['Fastball', 'Sinker', 'Cutter', 'Slider', 'Curveball', 'ChangeUp', 'Sweeper', 'Splitter', 'Knuckleball']
+PITCH_TYPE_PRIORITY_INDEX = {name: i for i, name in enumerate(PITCH_TYPE_PRIORITY)}
+
+@lru_cache(maxsize=64)
+def pitch_type_variation_priority(pitch_type):
+    """Priority of the first priority type contained in the pitch type name (e.g. 'Four-Seam Fastball')"""
+    pitch_type_lower = pitch_type.lower()
+    for i, priority_type in enumerate(PITCH_TYPE_PRIORITY):
+        if priority_type.lower() in pitch_type_lower:
+            return i
+    return len(PITCH_TYPE_PRIORITY)
+
+def sort_pitch_types(pitch_types, match_variations=False):
+    """Sort pitch types by priority, then alphabetically for the rest"""
+    if match_variations:
+        priority = pitch_type_variation_priority
+    else:
+        def priority(pitch_type):
+            return PITCH_TYPE_PRIORITY_INDEX.get(pitch_type, len(PITCH_TYPE_PRIORITY))
+    
+    return sorted(pitch_types, key=lambda pitch_type: (priority(pitch_type), pitch_type))
+
 # Update the get_multi_level_comparisons function:
 
-def get_multi_level_comparisons(pitch_data, pitcher_throws='Right'):
-    """Get percentile-based comparisons while maintaining existing UI structure and adding college averages"""
+def get_multi_level_comparisons(pitch_data, pitcher_throws='Right', comparison_level=None,
+                                pitch_type_data=None, pitch_type_averages=None):
+    """Get percentile-based comparisons while maintaining existing UI structure and adding college averages.
+    
+    Pass the pitcher's comparison_level when it's already known to skip the Info table lookup,
+    and pitch_type_data (from group_pitches_by_type) / pitch_type_averages (average_pitch_metrics
+    per type) to reuse work the caller has already done.
+    """
     try:
         # Group pitches by type (same as before)
-        pitch_type_data = {}
-        
-        for pitch in pitch_data:
-            pitch_type = pitch.get('TaggedPitchType', 'Unknown')
-            if pitch_type not in pitch_type_data:
-                pitch_type_data[pitch_type] = {
-                    'pitches': [],
-                    'count': 0
-                }
-            pitch_type_data[pitch_type]['pitches'].append(pitch)
-            pitch_type_data[pitch_type]['count'] += 1
+        if pitch_type_data is None:
+            pitch_type_data = group_pitches_by_type(pitch_data)
         
         # Same sorting logic as before
         multi_level_breakdown = []
-        pitcher_name = pitch_data[0].get('Pitcher') if pitch_data else None
-        pitcher_comparison_level = get_pitcher_competition_level(pitcher_name) if pitcher_name else 'D1'
+        pitcher_comparison_level = comparison_level
+        if pitcher_comparison_level is None:
+            pitcher_name = pitch_data[0].get('Pitcher') if pitch_data else None
+            pitcher_comparison_level = get_pitcher_competition_level(pitcher_name) if pitcher_name else 'D1'
         levels = ['D1', 'D2', 'D3']
         
-        priority_types = ['Fastball', 'Sinker', 'Cutter', 'Slider', 'Curveball', 'ChangeUp', 'Sweeper', 'Splitter', 'Knuckleball']
-        
-        sorted_pitch_types = []
-        for priority_type in priority_types:
-            for actual_type in pitch_type_data.keys():
-                if priority_type.lower() in actual_type.lower() and actual_type not in sorted_pitch_types:
-                    sorted_pitch_types.append(actual_type)
-                    break
-        
-        remaining_types = [pt for pt in pitch_type_data.keys() if pt not in sorted_pitch_types]
-        sorted_pitch_types.extend(sorted(remaining_types))
+        sorted_pitch_types = sort_pitch_types(pitch_type_data, match_variations=True)
         
         for i, pitch_type in enumerate(sorted_pitch_types):
-            pitches = pitch_type_data[pitch_type]['pitches']
-            count = pitch_type_data[pitch_type]['count']
-            
-            # Same metric extraction as before
-            velocities = [p.get('RelSpeed', 0) for p in pitches if p.get('RelSpeed')]
-            spin_rates = [p.get('SpinRate', 0) for p in pitches if p.get('SpinRate')]
-            ivbs = [p.get('InducedVertBreak', 0) for p in pitches if p.get('InducedVertBreak')]
-            hbs = [p.get('HorzBreak', 0) for p in pitches if p.get('HorzBreak')]
-            rel_heights = [p.get('RelHeight', 0) for p in pitches if p.get('RelHeight')]
-            rel_sides = [p.get('RelSide', 0) for p in pitches if p.get('RelSide')]
-            extensions = [p.get('Extension', 0) for p in pitches if p.get('Extension')]
+            pitches = pitch_type_data[pitch_type]
+            count = len(pitches)
             
-            # Same average calculations as before
-            pitcher_avg_velocity = sum(velocities)/len(velocities) if velocities else None
-            pitcher_max_velocity = max(velocities) if velocities else None
-            pitcher_avg_spin = sum(spin_rates)/len(spin_rates) if spin_rates else None
-            pitcher_avg_ivb = sum(ivbs)/len(ivbs) if ivbs else None
-            pitcher_avg_hb = sum(hbs)/len(hbs) if hbs else None
-            pitcher_avg_rel_height = sum(rel_heights)/len(rel_heights) if rel_heights else None
-            pitcher_avg_rel_side = sum(rel_sides)/len(rel_sides) if rel_sides else None
-            pitcher_avg_extension = sum(extensions)/len(extensions) if extensions else None
+            # Pitcher's averages for this pitch type
+            if pitch_type_averages is not None:
+                averages = pitch_type_averages[pitch_type]
+            else:
+                averages = average_pitch_metrics(pitches)
             
             level_comparisons = {}
             
             # Get both percentile data AND college averages for each level
             for level in levels:
-                # Get percentile data
-                college_data = get_college_percentile_data(pitch_type, level, pitcher_throws)
-                college_max_velo_data = get_college_max_velocity_percentile_data(pitch_type, level, pitcher_throws)
-                
                 # Get college averages (your existing function)
                 college_averages = get_college_averages(pitch_type, level, pitcher_throws)
                 college_max_velo_averages = get_college_max_velocity_averages(pitch_type, level, pitcher_throws)
                 
-                # Calculate percentiles
-                velocity_diff = calculate_difference_from_average_with_percentile(
-                    pitcher_avg_velocity, 
-                    college_data['velocity'] if college_data else None,
-                    metric_name='velocity',
-                    pitch_type=pitch_type
-                )
+                # No college data for this pitch type at this level - skip the percentile queries
+                if college_averages is None and college_max_velo_averages is None:
+                    level_comparisons[level] = EMPTY_LEVEL_COMPARISON
+                    continue
                 
-                max_velocity_diff = calculate_difference_from_average_with_percentile(
-                    pitcher_max_velocity, 
-                    college_max_velo_data,
-                    metric_name='velocity',
-                    pitch_type=pitch_type
-                )
+                college_values = dict(college_averages or {})
+                college_values.update(college_max_velo_averages or {})
                 
-                spin_diff = calculate_difference_from_average_with_percentile(
-                    pitcher_avg_spin, 
-                    college_data['spin_rate'] if college_data else None,
-                    metric_name='spin_rate',
-                    pitch_type=pitch_type
-                )
-                
-                ivb_diff = calculate_difference_from_average_with_percentile(
-                    pitcher_avg_ivb, 
-                    college_data['ivb'] if college_data else None,
-                    metric_name='ivb',
-                    pitch_type=pitch_type
-                )
-                
-                hb_diff = calculate_difference_from_average_with_percentile(
-                    pitcher_avg_hb, 
-                    college_data['hb'] if college_data else None,
-                    metric_name='hb',
-                    pitch_type=pitch_type,
-                    pitcher_throws=pitcher_throws
-                )
-                
-                rel_height_diff = calculate_difference_from_average_with_percentile(
-                    pitcher_avg_rel_height, 
-                    college_data['rel_height'] if college_data else None
-                )
-                
-                rel_side_diff = calculate_difference_from_average_with_percentile(
-                    pitcher_avg_rel_side, 
-                    college_data['rel_side'] if college_data else None
-                )
-                
-                extension_diff = calculate_difference_from_average_with_percentile(
-                    pitcher_avg_extension, 
-                    college_data['extension'] if college_data else None
-                )
+                # Get percentile data (max velocity comes from its own per-pitcher query)
+                college_data = get_college_percentile_data(pitch_type, level, pitcher_throws)
+                percentile_data = dict(college_data or {})
+                percentile_data['max_velocity'] = get_college_max_velocity_percentile_data(pitch_type, level, pitcher_throws)
                 
                 # Provide both college averages AND percentiles
                 level_comparisons[level] = {
-                    'velocity': {
-                        'college_avg': f"{college_averages['avg_velocity']:.1f}" if college_averages and college_averages.get('avg_velocity') else 'N/A',
-                        'comparison': velocity_diff,
-                        'difference': f"{velocity_diff['difference']:.0f}%" if velocity_diff else 'N/A'
-                    },
-                    'max_velocity': {
-                        'college_avg': f"{college_max_velo_averages['avg_max_velocity']:.1f}" if college_max_velo_averages and college_max_velo_averages.get('avg_max_velocity') else 'N/A',
-                        'comparison': max_velocity_diff,
-                        'difference': f"{max_velocity_diff['difference']:.0f}%" if max_velocity_diff else 'N/A'
-                    },
-                    'spin': {
-                        'college_avg': f"{college_averages['avg_spin_rate']:.0f}" if college_averages and college_averages.get('avg_spin_rate') else 'N/A',
-                        'comparison': spin_diff,
-                        'difference': f"{spin_diff['difference']:.0f}%" if spin_diff else 'N/A'
-                    },
-                    'ivb': {
-                        'college_avg': f"{college_averages['avg_ivb']:.1f}" if college_averages and college_averages.get('avg_ivb') else 'N/A',
-                        'comparison': ivb_diff,
-                        'difference': f"{ivb_diff['difference']:.0f}%" if ivb_diff else 'N/A'
-                    },
-                    'hb': {
-                        'college_avg': f"{college_averages['avg_hb']:.1f}" if college_averages and college_averages.get('avg_hb') else 'N/A',
-                        'comparison': hb_diff,
-                        'difference': f"{hb_diff['difference']:.0f}%" if hb_diff else 'N/A'
-                    },
-                    'rel_height': {
-                        'college_avg': f"{college_averages['avg_rel_height']:.1f}" if college_averages and college_averages.get('avg_rel_height') else 'N/A',
-                        'comparison': rel_height_diff,
-                        'difference': f"{rel_height_diff['difference']:.0f}%" if rel_height_diff else 'N/A'
-                    },
-                    'rel_side': {
-                        'college_avg': f"{college_averages['avg_rel_side']:.1f}" if college_averages and college_averages.get('avg_rel_side') else 'N/A',
-                        'comparison': rel_side_diff,
-                        'difference': f"{rel_side_diff['difference']:.0f}%" if rel_side_diff else 'N/A'
-                    },
-                    'extension': {
-                        'college_avg': f"{college_averages['avg_extension']:.1f}" if college_averages and college_averages.get('avg_extension') else 'N/A',
-                        'comparison': extension_diff,
-                        'difference': f"{extension_diff['difference']:.0f}%" if extension_diff else 'N/A'
-                    }
+                    metric.key: build_metric_cell(
+                        averages[metric.key],
+                        percentile_data.get(metric.data_key),
+                        college_values.get(metric.average_key),
+                        metric,
+                        pitch_type,
+                        pitcher_throws
+                    )
+                    for metric in COMPARISON_METRICS
                 }
             
             # Same structure as before, but add is_first flag
@@ -1786,14 +2147,7 @@ def get_multi_level_comparisons(pitch_data, pitcher_throws='Right'):
                 'name': pitch_type,
                 'count': count,
                 'is_first': i == 0,  # Add this flag to identify first pitch type
-                'pitcher_velocity': f"{pitcher_avg_velocity:.1f}" if pitcher_avg_velocity else 'N/A',
-                'pitcher_max_velocity': f"{pitcher_max_velocity:.1f}" if pitcher_max_velocity else 'N/A',
-                'pitcher_spin': f"{pitcher_avg_spin:.0f}" if pitcher_avg_spin else 'N/A',
-                'pitcher_ivb': f"{pitcher_avg_ivb:.1f}" if pitcher_avg_ivb else 'N/A',
-                'pitcher_hb': f"{pitcher_avg_hb:.1f}" if pitcher_avg_hb else 'N/A',
-                'pitcher_rel_height': f"{pitcher_avg_rel_height:.1f}" if pitcher_avg_rel_height else 'N/A',
-                'pitcher_rel_side': f"{pitcher_avg_rel_side:.1f}" if pitcher_avg_rel_side else 'N/A',
-                'pitcher_extension': f"{pitcher_avg_extension:.1f}" if pitcher_avg_extension else 'N/A',
+                **{f"pitcher_{metric.key}": format_metric(averages[metric.key], metric.decimals) for metric in COMPARISON_METRICS},
                 'level_comparisons': level_comparisons,
                 'comparison_level': pitcher_comparison_level
             })
@@ -1808,34 +2162,130 @@ def get_multi_level_comparisons(pitch_data, pitcher_throws='Right'):
 
 
 # Add this new function to get pitcher's competition level from Info table
+def cache_competition_levels(rows):
+    """Cache {prospect: comp} from Info table rows (first non-null Comp wins)"""
+    competition_levels = {}
+    for row in rows:
+        if row['Comp'] and row['Prospect'] is not None:
+            competition_levels.setdefault(row['Prospect'], row['Comp'])
+    competition_levels_cache.set('all', competition_levels)
+    return competition_levels
+
 def get_pitcher_competition_level(pitcher_name):
     """Get the competition level for a specific pitcher from the Info table"""
     try:
-        query = """
-        SELECT Comp
-        FROM `V1PBRInfo.Info`
-        WHERE Prospect = @pitcher_name
-        LIMIT 1
-        """
-        
-        job_config = bigquery.QueryJobConfig(
-            query_parameters=[
-                bigquery.ScalarQueryParameter("pitcher_name", "STRING", pitcher_name),
-            ]
-        )
+        # The Info table is small, so load it once instead of querying per pitcher
+        competition_levels = competition_levels_cache.get('all')
+        if competition_levels is None:
+            competition_levels = cache_competition_levels(get_prospects())
         
-        result = client.query(query, job_config=job_config)
-        row = list(result)
-        
-        if row and row[0].Comp:
-            return row[0].Comp
-        else:
-            return 'D1'  # Default to D1 if no competition level found
+        return competition_levels.get(pitcher_name, 'D1')  # Default to D1 if no competition level found
             
     except Exception as e:
         print(f"Error getting competition level for {pitcher_name}: {str(e)}")
         return 'D1'  # Default to D1 on error
 
+# Jinja2 environment for the PDF report; auto_reload is off so the compiled
+# template is reused for every report without re-reading the file
+report_env = Environment(loader=FileSystemLoader('.'), auto_reload=False)
+
+# Serializes PDF rendering when reports are generated from worker threads
+weasyprint_lock = threading.Lock()
+
+# Absolute path to the current directory so WeasyPrint can find static files
+REPORT_BASE_URL = f"file://{os.path.abspath('.')}/"
+
+# Shared font configuration so fontconfig isn't re-initialized for every PDF
+report_font_config = FontConfiguration()
+
+# The report's CSS, kept out of the template so it's parsed once instead of for every PDF
+REPORT_STYLESHEET_PATH = 'pitcher_report.css'
+
+def load_report_stylesheet():
+    """Parse the report stylesheet, None if it can't be loaded (no reports are generated then)"""
+    try:
+        return weasyprint.CSS(filename=REPORT_STYLESHEET_PATH, font_config=report_font_config)
+    except Exception as e:
+        print(f"Error: couldn't load {REPORT_STYLESHEET_PATH}, PDF reports are disabled: {e}")
+        return None
+
+report_stylesheet = load_report_stylesheet()
+
+def check_report_static_files():
+    """Check (once, at server startup) that the static files used by the PDF report exist"""
+    static_dir = os.path.join(os.getcwd(), 'static')
+    if not os.path.exists(static_dir):
+        print(f"Warning: Static directory not found at {static_dir}")
+        os.makedirs(static_dir, exist_ok=True)
+        print(f"Created static directory at {static_dir}")
+    
+    # Check for required images
+    required_images = ['pbr.png', 'miss.png']
+    for image_name in required_images:
+        image_path = os.path.join(static_dir, image_name)
+        if os.path.exists(image_path):
+            print(f"Found image at: {image_path}")
+        else:
+            print(f"Warning: Image not found at {image_path}")
+
+# Caches copied into the PDF worker processes so they don't re-query college data
+PDF_WORKER_CACHES = [college_averages_cache, college_max_velocity_averages_cache, competition_levels_cache]
+
+def seed_pdf_worker_caches(cache_snapshots):
+    """Copy the parent's cached lookups into a PDF worker, keeping their original expiry"""
+    for cache, entries in zip(PDF_WORKER_CACHES, cache_snapshots):
+        for key, value, expires_in in entries:
+            cache.set(key, value, ttl=expires_in)
+
+def render_pdf_in_worker(cache_snapshots, pitcher_name, pitch_data, date, comparison_level=None):
+    """generate_pitcher_pdf in a PDF worker, after seeding it with the parent's current caches"""
+    seed_pdf_worker_caches(cache_snapshots)
+    return generate_pitcher_pdf(pitcher_name, pitch_data, date, comparison_level)
+
+def create_pdf_executor():
+    """Process pool for rendering PDFs in parallel"""
+    # spawn rather than fork: forking a process that has BigQuery/SMTP threads running isn't safe
+    return ProcessPoolExecutor(
+        max_workers=PDF_WORKERS,
+        mp_context=multiprocessing.get_context('spawn')
+    )
+
+# Shared by all batches so worker startup (interpreter + WeasyPrint import) is paid once.
+# Started on first use rather than at import, since spawned workers import this module too.
+pdf_executor = None
+pdf_executor_lock = threading.Lock()
+
+def get_pdf_executor():
+    """The shared PDF process pool, started if it isn't running"""
+    global pdf_executor
+    with pdf_executor_lock:
+        if pdf_executor is None:
+            pdf_executor = create_pdf_executor()
+        return pdf_executor
+
+def discard_pdf_executor():
+    """Shut the shared PDF pool down; the next render starts a fresh one"""
+    global pdf_executor
+    with pdf_executor_lock:
+        executor, pdf_executor = pdf_executor, None
+    if executor is not None:
+        executor.shutdown(wait=False)
+
+def submit_pdf_render(pitcher_name, pitch_data, date, comparison_level=None):
+    """Render a report in the shared PDF pool, restarting the pool if a crashed worker broke it.
+    
+    Each job carries a snapshot of the lookup caches, so long-lived workers see what the
+    current batch preloaded instead of whatever was cached when they started.
+    """
+    cache_snapshots = [cache.snapshot() for cache in PDF_WORKER_CACHES]
+    args = (cache_snapshots, pitcher_name, pitch_data, date, comparison_level)
+    try:
+        return get_pdf_executor().submit(render_pdf_in_worker, *args)
+    except BrokenProcessPool:
+        print("PDF worker pool is broken, restarting it")
+        discard_pdf_executor()
+        return get_pdf_executor().submit(render_pdf_in_worker, *args)
+
 # Update the generate_pitcher_pdf function to automatically get comparison level
 # Update the generate_pitcher_pdf function to include zone rate data
 def generate_pitcher_pdf(pitcher_name, pitch_data, date, comparison_level=None):
@@ -1858,130 +2308,48 @@ def generate_pitcher_pdf(pitcher_name, pitch_data, date, comparison_level=None):
             comparison_level = get_pitcher_competition_level(pitcher_name)
             print(f"Retrieved competition level for {formatted_name}: {comparison_level}")
         
-        # Determine pitcher handedness from the data
-        pitcher_throws = 'Right'  # Default to right-handed
-        for pitch in pitch_data:
-            if pitch.get('PitcherThrows'):
-                pitcher_throws = pitch.get('PitcherThrows')
-                break
+        # Determine pitcher handedness from the data (default to right-handed)
+        pitcher_throws = next((throws for pitch in pitch_data if (throws := pitch.get('PitcherThrows'))), 'Right')
         
         print(f"Pitcher {formatted_name} throws: {pitcher_throws}")
             
-        # Group pitches by type and calculate averages
-        pitch_type_data = {}
-        
-        for pitch in pitch_data:
-            pitch_type = pitch.get('TaggedPitchType', 'Unknown')
-            if pitch_type not in pitch_type_data:
-                pitch_type_data[pitch_type] = {
-                    'pitches': [],
-                    'count': 0
-                }
-            pitch_type_data[pitch_type]['pitches'].append(pitch)
-            pitch_type_data[pitch_type]['count'] += 1
+        # Group pitches by type once; the multi-level comparisons reuse the grouping and averages
+        pitch_type_data = group_pitches_by_type(pitch_data)
         
         # Calculate averages for each pitch type WITH college comparisons
         pitch_type_breakdown = []
+        pitch_type_averages = {}
         
-        # Define priority order - Fastball first, then by general usage/importance
-        priority_types = ['Fastball', 'Sinker', 'Cutter', 'Slider', 'Curveball', 'ChangeUp', 'Sweeper', 'Splitter', 'Knuckleball']
-        
-        # Sort pitch types with priority
-        sorted_pitch_types = []
-        
-        # Add priority types first (if they exist)
-        for priority_type in priority_types:
-            if priority_type in pitch_type_data:
-                sorted_pitch_types.append(priority_type)
-        
-        # Add remaining types alphabetically
-        remaining_types = [pt for pt in pitch_type_data.keys() if pt not in sorted_pitch_types]
-        sorted_pitch_types.extend(sorted(remaining_types))
+        # Sort pitch types with priority (Fastball first), remaining types alphabetically
+        sorted_pitch_types = sort_pitch_types(pitch_type_data)
         
         for pitch_type in sorted_pitch_types:
-            pitches = pitch_type_data[pitch_type]['pitches']
-            count = pitch_type_data[pitch_type]['count']
-            
-            # Calculate averages for this pitch type
-            velocities = [p.get('RelSpeed', 0) for p in pitches if p.get('RelSpeed')]
-            spin_rates = [p.get('SpinRate', 0) for p in pitches if p.get('SpinRate')]
-            ivbs = [p.get('InducedVertBreak', 0) for p in pitches if p.get('InducedVertBreak')]
-            hbs = [p.get('HorzBreak', 0) for p in pitches if p.get('HorzBreak')]
-            rel_sides = [p.get('RelSide', 0) for p in pitches if p.get('RelSide')]
-            rel_heights = [p.get('RelHeight', 0) for p in pitches if p.get('RelHeight')]
-            extensions = [p.get('Extension', 0) for p in pitches if p.get('Extension')]
+            pitches = pitch_type_data[pitch_type]
+            count = len(pitches)
             
-            # Calculate pitcher's averages
-            pitcher_avg_velocity = sum(velocities)/len(velocities) if velocities else None
-            pitcher_avg_spin = sum(spin_rates)/len(spin_rates) if spin_rates else None
-            pitcher_avg_ivb = sum(ivbs)/len(ivbs) if ivbs else None
-            pitcher_avg_hb = sum(hbs)/len(hbs) if hbs else None
-            pitcher_avg_rel_side = sum(rel_sides)/len(rel_sides) if rel_sides else None
-            pitcher_avg_rel_height = sum(rel_heights)/len(rel_heights) if rel_heights else None
-            pitcher_avg_extension = sum(extensions)/len(extensions) if extensions else None
+            # Calculate pitcher's averages for this pitch type
+            averages = pitch_type_averages[pitch_type] = average_pitch_metrics(pitches)
             
             # Get college averages for comparison (with pitcher handedness)
             college_averages = get_college_averages(pitch_type, comparison_level, pitcher_throws)
+            college_values = college_averages or {}
             
-            # Calculate comparisons
-            velocity_comp = calculate_percentile(pitcher_avg_velocity, 
-                               college_averages['avg_velocity'] if college_averages else None,
-                               metric_name='velocity',
-                               pitch_type=pitch_type)
-            
-            spin_comp = calculate_percentile(pitcher_avg_spin, 
-                           college_averages['avg_spin_rate'] if college_averages else None,
-                           metric_name='spin_rate',
-                           pitch_type=pitch_type)
-            
-            ivb_comp = calculate_percentile(pitcher_avg_ivb, 
-                          college_averages['avg_ivb'] if college_averages else None,
-                          metric_name='ivb',
-                          pitch_type=pitch_type)
-            
-            hb_comp = calculate_percentile(pitcher_avg_hb, 
-                         college_averages['avg_hb'] if college_averages else None,
-                         metric_name='hb',
-                         pitch_type=pitch_type,
-                         pitcher_throws=pitcher_throws)
-            
-            rel_side_comp = calculate_percentile(pitcher_avg_rel_side, 
-                                               college_averages['avg_rel_side'] if college_averages else None)
-            
-            rel_height_comp = calculate_percentile(pitcher_avg_rel_height, 
-                                                 college_averages['avg_rel_height'] if college_averages else None)
-            
-            extension_comp = calculate_percentile(pitcher_avg_extension, 
-                                                college_averages['avg_extension'] if college_averages else None)
-            
-            pitch_type_breakdown.append({
-                'name': pitch_type,
-                'count': count,
-                'avg_velocity': f"{pitcher_avg_velocity:.1f}" if pitcher_avg_velocity else 'N/A',
-                'avg_spin': f"{pitcher_avg_spin:.0f}" if pitcher_avg_spin else 'N/A',
-                'avg_ivb': f"{pitcher_avg_ivb:.1f}" if pitcher_avg_ivb else 'N/A',
-                'avg_hb': f"{pitcher_avg_hb:.1f}" if pitcher_avg_hb else 'N/A',
-                'avg_rel_side': f"{pitcher_avg_rel_side:.1f}" if pitcher_avg_rel_side else 'N/A',
-                'avg_rel_height': f"{pitcher_avg_rel_height:.1f}" if pitcher_avg_rel_height else 'N/A',
-                'avg_extension': f"{pitcher_avg_extension:.1f}" if pitcher_avg_extension else 'N/A',
+            breakdown = {'name': pitch_type, 'count': count}
+            for metric in REPORT_METRICS:
+                pitcher_value = averages[metric.key]
+                college_value = college_values.get(metric.average_key)
+                breakdown[f"avg_{metric.key}"] = format_metric(pitcher_value, metric.decimals)
                 # College comparison data - always include, even if N/A
-                'college_velocity': f"{college_averages['avg_velocity']:.1f}" if college_averages and college_averages['avg_velocity'] else 'N/A',
-                'college_spin': f"{college_averages['avg_spin_rate']:.0f}" if college_averages and college_averages['avg_spin_rate'] else 'N/A',
-                'college_ivb': f"{college_averages['avg_ivb']:.1f}" if college_averages and college_averages['avg_ivb'] else 'N/A',
-                'college_hb': f"{college_averages['avg_hb']:.1f}" if college_averages and college_averages['avg_hb'] else 'N/A',
-                'college_rel_side': f"{college_averages['avg_rel_side']:.1f}" if college_averages and college_averages['avg_rel_side'] else 'N/A',
-                'college_rel_height': f"{college_averages['avg_rel_height']:.1f}" if college_averages and college_averages['avg_rel_height'] else 'N/A',
-                'college_extension': f"{college_averages['avg_extension']:.1f}" if college_averages and college_averages['avg_extension'] else 'N/A',
+                breakdown[f"college_{metric.key}"] = format_metric(college_value, metric.decimals)
                 # Comparison indicators - always include, even if None
-                'velocity_comp': velocity_comp,
-                'spin_comp': spin_comp,
-                'ivb_comp': ivb_comp,
-                'hb_comp': hb_comp,
-                'rel_side_comp': rel_side_comp,
-                'rel_height_comp': rel_height_comp,
-                'extension_comp': extension_comp,
-                'has_college_data': college_averages is not None
-            })
+                breakdown[f"{metric.key}_comp"] = calculate_percentile(
+                    pitcher_value, college_value,
+                    metric_name=metric.metric_name,
+                    pitch_type=pitch_type,
+                    pitcher_throws=pitcher_throws
+                )
+            breakdown['has_college_data'] = college_averages is not None
+            pitch_type_breakdown.append(breakdown)
         
         summary_stats = {
             'pitch_type_breakdown': pitch_type_breakdown,
@@ -1989,7 +2357,9 @@ def generate_pitcher_pdf(pitcher_name, pitch_data, date, comparison_level=None):
             'pitcher_throws': pitcher_throws
         }
 
-        multi_level_stats = get_multi_level_comparisons(pitch_data, pitcher_throws)
+        multi_level_stats = get_multi_level_comparisons(
+            pitch_data, pitcher_throws, comparison_level, pitch_type_data, pitch_type_averages
+        )
         
         # Generate SVG plots with debugging
         print(f"Generating plots for {formatted_name}...")
@@ -2018,16 +2388,19 @@ def generate_pitcher_pdf(pitcher_name, pitch_data, date, comparison_level=None):
         
         print(f"Generating PDF for {formatted_name} ({pitcher_throws}) with {len(pitch_data)} pitches and {comparison_level} comparisons")
         
-        # Read HTML template
+        # Load HTML template (compiled once, then served from the environment's cache)
         try:
-            with open('pitcher_report.html', 'r', encoding='utf-8') as file:
-                html_template = file.read()
-        except FileNotFoundError:
+            template = report_env.get_template('pitcher_report.html')
+        except TemplateNotFound:
             print("Error: pitcher_report.html not found. Make sure it's in the same directory as app.py")
             return None
         
+        # Don't email prospects an unstyled report
+        if report_stylesheet is None:
+            print(f"Error: {REPORT_STYLESHEET_PATH} couldn't be loaded. Make sure it's in the same directory as app.py")
+            return None
+        
         # Render template with data using Jinja2
-        template = Template(html_template)
         rendered_html = template.render(
             pitcher_name=formatted_name,
             date=date,
@@ -2041,28 +2414,13 @@ def generate_pitcher_pdf(pitcher_name, pitch_data, date, comparison_level=None):
         
         # Generate PDF using WeasyPrint with proper base_url for static files
         try:
-            # Get the absolute path to the current directory so WeasyPrint can find static files
-            base_url = f"file://{os.path.abspath('.')}/"
-            print(f"Using base_url: {base_url}")
-            
-            # Check if static files exist
-            static_dir = os.path.join(os.getcwd(), 'static')
-            if not os.path.exists(static_dir):
-                print(f"Warning: Static directory not found at {static_dir}")
-                os.makedirs(static_dir, exist_ok=True)
-                print(f"Created static directory at {static_dir}")
-            
-            # Check for required images
-            required_images = ['pbr.png', 'miss.png']
-            for image_name in required_images:
-                image_path = os.path.join(static_dir, image_name)
-                if os.path.exists(image_path):
-                    print(f"Found image at: {image_path}")
-                else:
-                    print(f"Warning: Image not found at {image_path}")
-            
-            html_doc = weasyprint.HTML(string=rendered_html, base_url=base_url)
-            pdf_bytes = html_doc.write_pdf()
+            # WeasyPrint (Pango/fontconfig) isn't safe to run from several threads at once
+            with weasyprint_lock:
+                html_doc = weasyprint.HTML(string=rendered_html, base_url=REPORT_BASE_URL)
+                pdf_bytes = html_doc.write_pdf(
+                    stylesheets=[report_stylesheet],
+                    font_config=report_font_config
+                )
             print(f"PDF generated successfully for {formatted_name}")
             return pdf_bytes
         except Exception as e:
@@ -2077,9 +2435,136 @@ def generate_pitcher_pdf(pitcher_name, pitch_data, date, comparison_level=None):
         traceback.print_exc()
         return None
 
+# Recently rendered reports, so retried sends don't re-render (or re-encode) identical PDFs.
+# Kept short-lived since the reports also include (cached) college data.
+pdf_cache = TTLCache(ttl=600, maxsize=32)
+
+# A rendered report: the PDF bytes plus its email attachment part, base64-encoded once
+CachedReport = namedtuple('CachedReport', ['pdf_data', 'attachment'])
+
+def report_display_name(pitcher_name):
+    """'Smith, Jack' -> 'Jack Smith' (other names are returned as is)"""
+    if ', ' in pitcher_name:
+        last_name, first_name = pitcher_name.split(', ', 1)
+        return f"{first_name} {last_name}"
+    return pitcher_name
+
+def build_pdf_attachment(pitcher_name, date, pdf_data):
+    """Attachment part for a pitcher's report PDF, named after the pitcher and date"""
+    safe_name = report_display_name(pitcher_name).replace(" ", "_").replace(",", "")
+    attachment = MIMEPart()
+    attachment.set_content(
+        pdf_data,
+        maintype='application',
+        subtype='pdf',
+        disposition='attachment',
+        filename=f"{safe_name}_Report_{date}.pdf"
+    )
+    return attachment
+
+def cache_report(pdf_key, pitcher_name, date, pdf_data):
+    """Store a rendered PDF in pdf_cache along with its attachment part, and return the entry"""
+    report = CachedReport(pdf_data, build_pdf_attachment(pitcher_name, date, pdf_data))
+    pdf_cache.set(pdf_key, report)
+    return report
+
+def pdf_cache_key(pitcher_name, pitch_data, date, comparison_level):
+    """sha1 of everything a pitcher's report is rendered from"""
+    payload = json.dumps([pitcher_name, date, comparison_level, pitch_data], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+def generate_pitcher_pdf_cached(pitcher_name, pitch_data, date, comparison_level):
+    """generate_pitcher_pdf as a CachedReport, reusing one rendered from the same data (None on failure)"""
+    pdf_key = pdf_cache_key(pitcher_name, pitch_data, date, comparison_level)
+    report = pdf_cache.get(pdf_key)
+    if report is None:
+        pdf_data = generate_pitcher_pdf(pitcher_name, pitch_data, date, comparison_level)
+        if pdf_data:
+            report = cache_report(pdf_key, pitcher_name, date, pdf_data)
+    return report
+
 # Update the send_pitcher_email function to automatically get comparison level
-def send_pitcher_email(pitcher_name, email, pitch_data, date, comparison_level=None):
-    """Send email to pitcher with PDF attachment (using WeasyPrint)"""
+def open_smtp_connection():
+    """Open an SMTP connection, start TLS and log in"""
+    server = smtplib.SMTP(EMAIL_HOST, EMAIL_PORT)
+    server.starttls()
+    server.login(EMAIL_USERNAME, EMAIL_PASSWORD)
+    return server
+
+def close_smtp_connection(server):
+    """Log out of an SMTP connection, ignoring errors from one that already dropped"""
+    try:
+        server.quit()
+    except (smtplib.SMTPException, OSError) as e:
+        print(f"Error closing SMTP connection: {e}")
+
+class SMTPConnectionPool:
+    """Logged-in SMTP connections kept open between sends and between requests.
+    
+    A send borrows an idle connection (or opens one if none is free) and hands it
+    back afterwards, so the connect/STARTTLS/login handshake is paid once per
+    connection instead of once per email.
+    """
+    
+    def __init__(self, maxsize):
+        self._idle = queue.Queue(maxsize=maxsize)
+    
+    def _borrow(self):
+        try:
+            server = self._idle.get_nowait()
+        except queue.Empty:
+            return open_smtp_connection()
+        # Idle connections may have been timed out by the server
+        try:
+            server.noop()
+            return server
+        except (smtplib.SMTPException, OSError):
+            print("Idle SMTP connection went stale, reconnecting...")
+            close_smtp_connection(server)
+            return open_smtp_connection()
+    
+    def _release(self, server):
+        try:
+            self._idle.put_nowait(server)
+        except queue.Full:
+            close_smtp_connection(server)
+    
+    def send_message(self, msg):
+        server = self._borrow()
+        try:
+            try:
+                server.send_message(msg)
+            except smtplib.SMTPServerDisconnected:
+                print("SMTP connection dropped, reconnecting...")
+                server = open_smtp_connection()
+                server.send_message(msg)
+        except Exception:
+            # Don't hand a connection in an unknown state to the next sender
+            close_smtp_connection(server)
+            raise
+        self._release(server)
+    
+    def close(self):
+        while True:
+            try:
+                server = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            close_smtp_connection(server)
+
+# Enough idle connections for every email-sending thread of a batch
+SMTP_POOL_SIZE = EMAIL_SEND_WORKERS
+smtp_pool = SMTPConnectionPool(SMTP_POOL_SIZE)
+# Log out of the idle connections on shutdown instead of leaving them to time out
+atexit.register(smtp_pool.close)
+
+def send_pitcher_email(pitcher_name, email, pitch_data, date, comparison_level=None, smtp_server=None, report=None):
+    """Send email to pitcher with PDF attachment (using WeasyPrint).
+    
+    Sends through the shared smtp_pool unless another smtp_server (anything with
+    send_message) is passed. report (a CachedReport) skips generating and
+    encoding the PDF when it has already been rendered.
+    """
     try:
         # Check if email config is available
         if not EMAIL_USERNAME or not EMAIL_PASSWORD:
@@ -2091,17 +2576,14 @@ def send_pitcher_email(pitcher_name, email, pitch_data, date, comparison_level=N
             comparison_level = get_pitcher_competition_level(pitcher_name)
         
         # Generate PDF using WeasyPrint with college comparisons
-        pdf_data = generate_pitcher_pdf(pitcher_name, pitch_data, date, comparison_level)
-        if not pdf_data:
+        if report is None:
+            report = generate_pitcher_pdf_cached(pitcher_name, pitch_data, date, comparison_level)
+        if not report:
             print(f"Failed to generate PDF for {pitcher_name}")
             return False
         
         # Format pitcher name for display
-        if ', ' in pitcher_name:
-            last_name, first_name = pitcher_name.split(', ', 1)
-            display_name = f"{first_name} {last_name}"
-        else:
-            display_name = pitcher_name
+        display_name = report_display_name(pitcher_name)
         
         # Calculate basic stats for email body
         total_pitches = len(pitch_data) if pitch_data else 0
@@ -2125,35 +2607,23 @@ Coaching Staff
 """
         
         # Create email message
-        msg = MIMEMultipart()
+        msg = EmailMessage()
         msg['Subject'] = subject
         msg['From'] = EMAIL_FROM
         msg['To'] = email
         
         # Add body
-        msg.attach(MIMEText(body, 'plain'))
-        
-        # Add PDF attachment
-        pdf_attachment = MIMEBase('application', 'octet-stream')
-        pdf_attachment.set_payload(pdf_data)
-        encoders.encode_base64(pdf_attachment)
+        msg.set_content(body)
         
-        # Create filename (use display name for filename)
-        safe_name = display_name.replace(" ", "_").replace(",", "")
-        filename = f"{safe_name}_Report_{date}.pdf"
-        
-        pdf_attachment.add_header(
-            'Content-Disposition',
-            f'attachment; filename="{filename}"'
-        )
-        msg.attach(pdf_attachment)
+        # Add the PDF attachment, already encoded when the report was cached. Attach a
+        # copy, since generating a message briefly changes its parts' policy.
+        msg.make_mixed()
+        msg.attach(copy.copy(report.attachment))
         
         # Send email
-        server = smtplib.SMTP(EMAIL_HOST, EMAIL_PORT)
-        server.starttls()
-        server.login(EMAIL_USERNAME, EMAIL_PASSWORD)
-        server.send_message(msg)
-        server.quit()
+        if smtp_server is None:
+            smtp_server = smtp_pool
+        smtp_server.send_message(msg)
         
         print(f"Email with PDF sent successfully to {display_name} at {email}")
         return True
@@ -2164,6 +2634,27 @@ Coaching Staff
         traceback.print_exc()
         return False
 
+# Caches cleared by /api/cache/invalidate (e.g. after the Info or college tables are updated)
+INVALIDATABLE_CACHES = {
+    'prospects': prospects_cache,
+    'competition_levels': competition_levels_cache,
+    'college_averages': college_averages_cache,
+    'college_averages_preloaded': college_averages_preloaded,
+    'college_max_velocity_averages': college_max_velocity_averages_cache,
+    'pdfs': pdf_cache,
+    'pitch_data': pitch_data_cache,
+    'prefetched_dates': prefetched_dates,
+}
+
+@app.route('/api/cache/invalidate', methods=['POST'])
+def invalidate_cache():
+    """API endpoint to clear the in-memory query caches"""
+    for cache in INVALIDATABLE_CACHES.values():
+        cache.clear()
+    # PDF workers hold their own copies of the lookup caches
+    discard_pdf_executor()
+    return jsonify({'success': True, 'cleared': list(INVALIDATABLE_CACHES)})
+
 # Update the send_emails route to remove comparison_level parameter
 @app.route('/api/send-emails', methods=['POST'])
 def send_emails():
@@ -2171,6 +2662,10 @@ def send_emails():
     if not client:
         return jsonify({'error': 'BigQuery client not initialized'}), 500
     
+    # Check before rendering any PDFs; every send would fail without credentials
+    if not EMAIL_USERNAME or not EMAIL_PASSWORD:
+        return jsonify({'error': 'Email configuration not available. Please check email_config.json'}), 500
+    
     try:
         data = request.get_json()
         selected_date = data.get('date')
@@ -2178,46 +2673,41 @@ def send_emails():
         if not selected_date:
             return jsonify({'error': 'Date is required'}), 400
         
+        date_predicate, date_parameter = date_filter(selected_date)
+        
         # Get pitchers for the selected date
-        pitchers_query = """
+        pitchers_query = f"""
         SELECT DISTINCT Pitcher
         FROM `V1PBR.Test`
-        WHERE CAST(Date AS STRING) = @date
+        WHERE {date_predicate}
         AND Pitcher IS NOT NULL
         ORDER BY Pitcher
         """
         
         job_config = bigquery.QueryJobConfig(
-            query_parameters=[
-                bigquery.ScalarQueryParameter("date", "STRING", selected_date),
-            ]
+            query_parameters=[date_parameter]
         )
         
         pitchers_result = client.query(pitchers_query, job_config=job_config)
         pitchers_from_test = [row.Pitcher for row in pitchers_result]
+        # Membership checks below go through a set instead of scanning the (ordered) list
+        test_pitcher_set = set(pitchers_from_test)
         
         # Get ALL prospect info from Info table
-        prospects_query = """
-        SELECT Event, Prospect, Email, Type, Comp
-        FROM `V1PBRInfo.Info`
-        ORDER BY Prospect
-        """
-        
-        prospects_result = client.query(prospects_query)
         all_prospects = []
         prospects_dict = {}
         
-        for row in prospects_result:
+        for row in get_prospects():
             prospect_info = {
-                'name': row.Prospect,
-                'email': row.Email,
-                'type': row.Type,
-                'event': row.Event,
-                'comp': row.Comp or 'D1'  # Default to D1 if Comp is null
+                'name': row['Prospect'],
+                'email': row['Email'],
+                'type': row['Type'],
+                'event': row['Event'],
+                'comp': row['Comp'] or 'D1'  # Default to D1 if Comp is null
             }
             all_prospects.append(prospect_info)
-            if row.Email:  # Only add to dict if email exists
-                prospects_dict[row.Prospect] = prospect_info
+            if row['Email']:  # Only add to dict if email exists
+                prospects_dict[row['Prospect']] = prospect_info
         
         # Analyze matches and mismatches
         matched_prospects = []
@@ -2228,54 +2718,11 @@ def send_emails():
         # Check each prospect against pitchers from Test table
         for prospect in all_prospects:
             prospect_name = prospect['name']
-            if prospect_name in pitchers_from_test:
+            if prospect_name in test_pitcher_set:
                 # This prospect has pitch data
                 if prospect['email']:
                     # Has email, can send
                     matched_prospects.append(prospect)
-                    
-                    # Get pitcher's detailed data and try to send email
-                    pitcher_data_query = """
-                    SELECT *
-                    FROM `V1PBR.Test`
-                    WHERE CAST(Date AS STRING) = @date
-                    AND Pitcher = @pitcher
-                    ORDER BY PitchNo
-                    """
-                    
-                    pitcher_job_config = bigquery.QueryJobConfig(
-                        query_parameters=[
-                            bigquery.ScalarQueryParameter("date", "STRING", selected_date),
-                            bigquery.ScalarQueryParameter("pitcher", "STRING", prospect_name),
-                        ]
-                    )
-                    
-                    pitcher_result = client.query(pitcher_data_query, job_config=pitcher_job_config)
-                    pitch_data = [dict(row) for row in pitcher_result]
-                    
-                    # Try to send email with automatic competition level
-                    comparison_level = prospect['comp']
-                    print(f"Attempting to send email to {prospect_name} at {prospect['email']} with {comparison_level} comparisons")
-                    email_success = send_pitcher_email(prospect_name, prospect['email'], pitch_data, selected_date, comparison_level)
-                    print(f"Email result for {prospect_name}: {email_success}")
-                    
-                    if email_success:
-                        sent_emails.append({
-                            'pitcher': prospect_name,
-                            'email': prospect['email'],
-                            'type': prospect['type'],
-                            'event': prospect['event'],
-                            'pitch_count': len(pitch_data),
-                            'comparison_level': comparison_level
-                        })
-                    else:
-                        failed_emails.append({
-                            'pitcher': prospect_name,
-                            'email': prospect['email'],
-                            'type': prospect['type'],
-                            'event': prospect['event'],
-                            'error': 'Email sending failed'
-                        })
                 else:
                     # Has pitch data but no email
                     unmatched_prospects.append({
@@ -2295,6 +2742,111 @@ def send_emails():
                     'reason': 'No pitch data for this date'
                 })
         
+        # Get detailed data for all matched pitchers in a single query
+        pitch_data_by_pitcher = defaultdict(list)
+        if matched_prospects:
+            # Load all college averages up front instead of querying them per pitcher
+            # (only the matched pitchers' reports read them)
+            preload_college_averages()
+            
+            pitcher_data_query = f"""
+            SELECT {PITCH_REPORT_SELECT}
+            FROM `V1PBR.Test`
+            WHERE {date_predicate}
+            AND Pitcher IN UNNEST(@pitchers)
+            ORDER BY Pitcher, PitchNo
+            """
+            
+            matched_names = list(dict.fromkeys(prospect['name'] for prospect in matched_prospects))
+            pitcher_job_config = bigquery.QueryJobConfig(
+                query_parameters=[
+                    date_parameter,
+                    bigquery.ArrayQueryParameter("pitchers", "STRING", matched_names),
+                ]
+            )
+            
+            for pitch in normalize_pitch_rows(query_rows(pitcher_data_query, job_config=pitcher_job_config)):
+                pitch_data_by_pitcher[pitch['Pitcher']].append(pitch)
+        
+        # Render PDFs in the shared worker processes and hand each one to the SMTP threads as
+        # soon as it's done, so PDF rendering (CPU) and sending (I/O) overlap. The SMTP threads
+        # share the module's pool of open connections.
+        email_futures = [None] * len(matched_prospects)
+        with ThreadPoolExecutor(max_workers=EMAIL_SEND_WORKERS) as email_executor:
+            def submit_email(i, report):
+                prospect = matched_prospects[i]
+                email_futures[i] = email_executor.submit(
+                    send_pitcher_email,
+                    prospect['name'],
+                    prospect['email'],
+                    pitch_data_by_pitcher.get(prospect['name'], []),
+                    selected_date,
+                    prospect['comp'],
+                    report=report
+                )
+            
+            pdf_futures = {}
+            for i, prospect in enumerate(matched_prospects):
+                # Try to send email with automatic competition level
+                print(f"Attempting to send email to {prospect['name']} at {prospect['email']} with {prospect['comp']} comparisons")
+                pitch_data = pitch_data_by_pitcher.get(prospect['name'], [])
+                pdf_key = pdf_cache_key(prospect['name'], pitch_data, selected_date, prospect['comp'])
+                
+                # Reports rendered recently (e.g. when a batch is retried) go straight to SMTP
+                report = pdf_cache.get(pdf_key)
+                if report is not None:
+                    submit_email(i, report)
+                    continue
+                
+                pdf_future = submit_pdf_render(
+                    prospect['name'],
+                    pitch_data,
+                    selected_date,
+                    prospect['comp']
+                )
+                pdf_futures[pdf_future] = (i, pdf_key)
+            
+            for pdf_future in as_completed(pdf_futures):
+                i, pdf_key = pdf_futures[pdf_future]
+                prospect = matched_prospects[i]
+                try:
+                    pdf_data = pdf_future.result()
+                except Exception as e:
+                    print(f"PDF worker failed for {prospect['name']}: {str(e)}")
+                    pdf_data = None
+                if not pdf_data:
+                    print(f"Failed to generate PDF for {prospect['name']}")
+                    continue
+                
+                # Cache it with its encoded attachment so a retried batch skips both steps
+                submit_email(i, cache_report(pdf_key, prospect['name'], selected_date, pdf_data))
+    
+        # Collect results in prospect order
+        for prospect, email_future in zip(matched_prospects, email_futures):
+            prospect_name = prospect['name']
+            pitch_data = pitch_data_by_pitcher.get(prospect_name, [])
+            comparison_level = prospect['comp']
+            email_success = email_future.result() if email_future else False
+            print(f"Email result for {prospect_name}: {email_success}")
+            
+            if email_success:
+                sent_emails.append({
+                    'pitcher': prospect_name,
+                    'email': prospect['email'],
+                    'type': prospect['type'],
+                    'event': prospect['event'],
+                    'pitch_count': len(pitch_data),
+                    'comparison_level': comparison_level
+                })
+            else:
+                failed_emails.append({
+                    'pitcher': prospect_name,
+                    'email': prospect['email'],
+                    'type': prospect['type'],
+                    'event': prospect['event'],
+                    'error': 'Email sending failed'
+                })
+        
         # Summary statistics
         total_prospects = len(all_prospects)
         total_matched = len(matched_prospects)
@@ -2337,24 +2889,25 @@ def send_individual_email():
         if not selected_date or not pitcher_name or not pitcher_email:
             return jsonify({'error': 'Date, pitcher name, and email are required'}), 400
         
+        date_predicate, date_parameter = date_filter(selected_date)
+        
         # Get pitcher's detailed data
-        pitcher_data_query = """
-        SELECT *
+        pitcher_data_query = f"""
+        SELECT {PITCH_REPORT_SELECT}
         FROM `V1PBR.Test`
-        WHERE CAST(Date AS STRING) = @date
+        WHERE {date_predicate}
         AND Pitcher = @pitcher
         ORDER BY PitchNo
         """
         
         pitcher_job_config = bigquery.QueryJobConfig(
             query_parameters=[
-                bigquery.ScalarQueryParameter("date", "STRING", selected_date),
+                date_parameter,
                 bigquery.ScalarQueryParameter("pitcher", "STRING", pitcher_name),
             ]
         )
         
-        pitcher_result = client.query(pitcher_data_query, job_config=pitcher_job_config)
-        pitch_data = [dict(row) for row in pitcher_result]
+        pitch_data = normalize_pitch_rows(query_rows(pitcher_data_query, job_config=pitcher_job_config))
         
         if not pitch_data:
             return jsonify({'error': f'No pitch data found for {pitcher_name} on {selected_date}'}), 400
@@ -2396,4 +2949,6 @@ if __name__ == '__main__':
     print("Make sure harvard-baseball-13fab221b2d4.json is in the same directory")
     print("Make sure templates/index.html exists")
     print("Make sure pitcher_report.html exists")
+    # Here rather than at import, since every spawned PDF worker imports this module too
+    check_report_static_files()
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file